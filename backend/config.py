@@ -10,3 +10,5 @@ CREATOR_SHEET_CSV_URL = os.getenv(
     "https://docs.google.com/spreadsheets/d/e/2PACX-1vTQcA8MAAhZ4urj_91M7rq80UwsmR3XePus2j2Ky-iZD_j_YSC5U5-kdSf2P1E73fohaAZWqJ6a4i2w/pub?output=csv&gid=651686011",
 )
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "/tmp/payout_reports")
+PHASH_CACHE_PATH = os.getenv("PHASH_CACHE_PATH", "/tmp/payout_cache/phash_cache.sqlite")
+PHASH_EXTRACTION_WORKERS = int(os.getenv("PHASH_EXTRACTION_WORKERS", "8"))
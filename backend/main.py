@@ -7,6 +7,7 @@ Wires together all service modules into a full pipeline:
     1. Validate request (start_date <= end_date)
     2. Fetch creator mapping from Google Sheet (creator_mapping.py)
     3. Fetch videos from Shortimize API (shortimize.py) → valid_videos + api_exceptions
+       (Steps 2 and 3 are independent and run concurrently)
     4. Run matching: map→dedup→pair (matcher.py) → payout_units + match_exceptions
     5. Calculate payouts (payout.py) → payout_units with amounts + creator_summaries
     6. Build exception_counts per creator for CreatorSummary
@@ -24,21 +25,26 @@ Error handling:
 """
 
 import os
+import shutil
+import stat
+import asyncio
 import logging
+from collections import Counter
 from datetime import date
 
+import httpx
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
 
 from models.schemas import CalculateRequest, CalculateResponse, ExceptionVideo
 import config
-from services.creator_mapping import fetch_creator_mapping
+from services.creator_mapping import (
+    fetch_creator_mapping,
+    invalidate_creator_mapping_cache,
+)
 from services.shortimize import fetch_videos
-from services.matcher import match_videos
-from services.payout import run_payout_pipeline
-from services.excel_export import generate_report
-from services.frame_extractor import check_dependencies
 
 # ---------------------------------------------------------------------------
 # Logging setup
@@ -52,16 +58,24 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 # Verify system dependencies (checked in startup event, not at import time)
 # ---------------------------------------------------------------------------
+REQUIRED_TOOLS = ("yt-dlp", "ffmpeg")
+
+
 def _check_system_dependencies():
-    """Check that yt-dlp and ffmpeg are available. Called on app startup."""
-    deps_ok, missing_deps = check_dependencies()
-    if not deps_ok:
+    """
+    Check that yt-dlp and ffmpeg are available. Called on app startup.
+
+    Only looks the tools up on PATH, so startup doesn't have to import the
+    frame extraction stack (imagehash/PIL) before a video needs a frame.
+    """
+    missing_deps = [tool for tool in REQUIRED_TOOLS if shutil.which(tool) is None]
+    if missing_deps:
         logger.error(
-            f"MISSING SYSTEM DEPENDENCIES: {', '.join(missing_deps)}. "
-            f"Install with: "
-            f"{'pip install yt-dlp' if 'yt-dlp' in missing_deps else ''}"
-            f"{' && ' if len(missing_deps) == 2 else ''}"
-            f"{'brew install ffmpeg (Mac) or apt install ffmpeg (Linux)' if 'ffmpeg' in missing_deps else ''}"
+            "MISSING SYSTEM DEPENDENCIES: %s. Install with: %s%s%s",
+            ", ".join(missing_deps),
+            "pip install yt-dlp" if "yt-dlp" in missing_deps else "",
+            " && " if len(missing_deps) == 2 else "",
+            "brew install ffmpeg (Mac) or apt install ffmpeg (Linux)" if "ffmpeg" in missing_deps else "",
         )
         raise RuntimeError(
             f"Required system dependencies not found: {', '.join(missing_deps)}. "
@@ -76,8 +90,26 @@ app = FastAPI(
     title="Polymarket Creator Payout Tool",
     description="Automates payout calculations for short-form video campaigns",
     version="2.0.0",
+    # orjson-backed JSON rendering for all endpoint responses
+    default_response_class=ORJSONResponse,
 )
 
+# ---------------------------------------------------------------------------
+# Response compression — JSON only; generated .xlsx files are already zip
+# archives, so downloads are passed through without re-compressing them
+# ---------------------------------------------------------------------------
+class ReportAwareGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips /api/download/ responses."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/api/download/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(ReportAwareGZipMiddleware, minimum_size=1024, compresslevel=6)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -86,19 +118,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---------------------------------------------------------------------------
+# Shared outbound HTTP client
+# ---------------------------------------------------------------------------
+# One pooled client for the Google Sheet and Shortimize fetchers, so repeated
+# /api/calculate calls reuse warm TLS connections (HTTP/2 where the server
+# negotiates it) instead of paying a fresh handshake per request.
+HTTP_TIMEOUT = 60.0
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
+
+def _create_http_client() -> httpx.Client:
+    """Build the shared client. SSL verification disabled (Cloudflare/macOS compat)."""
+    return httpx.Client(
+        http2=True,
+        verify=False,
+        follow_redirects=True,
+        timeout=HTTP_TIMEOUT,
+        limits=HTTP_LIMITS,
+    )
+
+
 # Run startup checks
 @app.on_event("startup")
 async def startup_event():
     _check_system_dependencies()
+    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+    app.state.http_client = _create_http_client()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    http_client = getattr(app.state, "http_client", None)
+    if http_client is not None:
+        http_client.close()
 
-# Ensure output directory exists at startup
-os.makedirs(config.OUTPUT_DIR, exist_ok=True)
 
 
 # ===========================================================================
 # POST /api/calculate — Full payout pipeline
 # ===========================================================================
 
+_BANNER = "=" * 60
+
 @app.post("/api/calculate", response_model=CalculateResponse)
 async def calculate_payouts(request: CalculateRequest):
     """
@@ -106,23 +168,29 @@ async def calculate_payouts(request: CalculateRequest):
 
     Pipeline steps:
       1. Validate dates
-      2. Fetch creator mapping (Google Sheet)
-      3. Fetch videos (Shortimize API)
+      2. Fetch creator mapping (Google Sheet)      } concurrently
+      3. Fetch videos (Shortimize API)             }
       4. Match videos (Steps 5-11: map → dedup → pair)
-      5. Calculate payouts (Steps A-D)
-      6. Build exception counts per creator
+      5. Calculate payouts per unit (Steps A-C)
+      6. Build exception counts, then creator summaries (Step D) once
       7. Generate .xlsx report
       8. Return summary response
 
     Returns:
         CalculateResponse with status, filename, and summary stats
     """
+    # Pipeline modules pull in imagehash/PIL (matcher) and openpyxl (report),
+    # so they're imported on first request instead of at worker boot
+    from services.matcher import match_videos
+    from services.payout import process_payouts, build_creator_summaries
+    from services.excel_export import generate_report
+
     start_date = request.start_date
     end_date = request.end_date
 
-    logger.info(f"=" * 60)
-    logger.info(f"PAYOUT CALCULATION: {start_date} to {end_date}")
-    logger.info(f"=" * 60)
+    logger.info(_BANNER)
+    logger.info("PAYOUT CALCULATION: %s to %s", start_date, end_date)
+    logger.info(_BANNER)
 
     # ------------------------------------------------------------------
     # Step 1: Validate dates
@@ -137,13 +205,21 @@ async def calculate_payouts(request: CalculateRequest):
         )
 
     # ------------------------------------------------------------------
-    # Step 2: Fetch creator mapping from Google Sheet
+    # Steps 2 + 3: Fetch creator mapping (Google Sheet) and videos
+    # (Shortimize API, Steps 1-4) concurrently — neither depends on the
+    # other. Both clients block on network I/O, so each runs in a worker
+    # thread to keep the event loop free.
     # ------------------------------------------------------------------
-    logger.info("Step 2: Fetching creator mapping from Google Sheet...")
-    try:
-        creators, tiktok_map, instagram_map = fetch_creator_mapping()
-    except Exception as e:
-        logger.error(f"Failed to fetch creator mapping: {e}")
+    logger.info("Steps 2-3: Fetching creator mapping and videos concurrently...")
+    http_client = getattr(app.state, "http_client", None)
+    mapping_result, videos_result = await asyncio.gather(
+        asyncio.to_thread(fetch_creator_mapping, http_client),
+        asyncio.to_thread(fetch_videos, start_date, end_date, http_client),
+        return_exceptions=True,
+    )
+
+    if isinstance(mapping_result, BaseException):
+        logger.error("Failed to fetch creator mapping: %s", mapping_result)
         raise HTTPException(
             status_code=502,
             detail={
@@ -152,19 +228,14 @@ async def calculate_payouts(request: CalculateRequest):
             },
         )
 
+    creators, tiktok_map, instagram_map = mapping_result
     logger.info(
-        f"  Creator mapping loaded: {len(creators)} creators, "
-        f"{len(tiktok_map)} TikTok handles, {len(instagram_map)} Instagram handles"
+        "  Creator mapping loaded: %d creators, %d TikTok handles, %d Instagram handles",
+        len(creators), len(tiktok_map), len(instagram_map),
     )
 
-    # ------------------------------------------------------------------
-    # Step 3: Fetch videos from Shortimize API (Steps 1-4)
-    # ------------------------------------------------------------------
-    logger.info("Step 3: Fetching videos from Shortimize API...")
-    try:
-        valid_videos, api_exceptions = fetch_videos(start_date, end_date)
-    except Exception as e:
-        logger.error(f"Failed to fetch video data: {e}")
+    if isinstance(videos_result, BaseException):
+        logger.error("Failed to fetch video data: %s", videos_result)
         raise HTTPException(
             status_code=502,
             detail={
@@ -173,62 +244,71 @@ async def calculate_payouts(request: CalculateRequest):
             },
         )
 
+    valid_videos, api_exceptions = videos_result
     logger.info(
-        f"  Videos fetched: {len(valid_videos)} valid, "
-        f"{len(api_exceptions)} filtered (exceptions)"
+        "  Videos fetched: %d valid, %d filtered (exceptions)",
+        len(valid_videos), len(api_exceptions),
     )
 
     # ------------------------------------------------------------------
     # Step 4: Match videos — Steps 5-11
     #   (creator mapping → dedup → sequence match + phash → fallback + phash)
+    #   Frame extraction blocks on yt-dlp/ffmpeg subprocesses, so matching
+    #   runs in a worker thread to keep the event loop serving other requests.
     # ------------------------------------------------------------------
-    logger.info("Step 4: Running cross-platform matching...")
-    payout_units, match_exceptions = match_videos(
-        valid_videos, tiktok_map, instagram_map
-    )
+    if valid_videos:
+        logger.info("Step 4: Running cross-platform matching...")
+        payout_units, match_exceptions = await asyncio.to_thread(
+            match_videos, valid_videos, tiktok_map, instagram_map
+        )
+    else:
+        # Nothing to match — still produce a (headers + exceptions) report
+        logger.info("Step 4: No valid videos — skipping matching")
+        payout_units, match_exceptions = [], []
 
     logger.info(
-        f"  Matching complete: {len(payout_units)} payout units, "
-        f"{len(match_exceptions)} match exceptions"
+        "  Matching complete: %d payout units, %d match exceptions",
+        len(payout_units), len(match_exceptions),
     )
 
     # ------------------------------------------------------------------
-    # Step 5: Calculate payouts (Steps A-D)
-    #   First pass without exception_counts (we'll fill those next)
+    # Step 5: Calculate payouts (Steps A-C) on each payout unit
     # ------------------------------------------------------------------
     logger.info("Step 5: Calculating payouts...")
-    processed_units, creator_summaries = run_payout_pipeline(payout_units)
-
-    total_payout = sum(s.total_payout for s in creator_summaries)
-    logger.info(
-        f"  Payouts calculated: {len(creator_summaries)} creators, "
-        f"total=${total_payout:,.2f}"
-    )
+    processed_units = process_payouts(payout_units)
 
     # ------------------------------------------------------------------
-    # Step 6: Combine all exceptions and build per-creator exception counts
+    # Step 6: Combine all exceptions, count them per creator, and build
+    # the per-creator summaries (Step D) once with those counts
     # ------------------------------------------------------------------
-    logger.info("Step 6: Building exception counts...")
+    logger.info("Step 6: Building exception counts and creator summaries...")
     all_exceptions = api_exceptions + match_exceptions
 
-    exception_counts = _count_exceptions_per_creator(
-        all_exceptions, tiktok_map, instagram_map
+    # Counts only feed summaries, and summaries only exist for creators with
+    # payout units — with no units there is nothing to count for
+    exception_counts = (
+        _count_exceptions_per_creator(all_exceptions, tiktok_map, instagram_map)
+        if processed_units
+        else {}
     )
-
-    # Rebuild summaries WITH exception counts
-    from services.payout import build_creator_summaries
     creator_summaries = build_creator_summaries(processed_units, exception_counts)
 
+    total_payout = sum(s.total_payout for s in creator_summaries)
     logger.info(
-        f"  Total exceptions: {len(all_exceptions)} "
-        f"(api={len(api_exceptions)}, match={len(match_exceptions)})"
+        "  Payouts calculated: %d creators, total=$%.2f",
+        len(creator_summaries), total_payout,
+    )
+    logger.info(
+        "  Total exceptions: %d (api=%d, match=%d)",
+        len(all_exceptions), len(api_exceptions), len(match_exceptions),
     )
 
     # ------------------------------------------------------------------
-    # Step 7: Generate .xlsx report
+    # Step 7: Generate .xlsx report (file I/O — also off the event loop)
     # ------------------------------------------------------------------
     logger.info("Step 7: Generating Excel report...")
-    filepath = generate_report(
+    filepath = await asyncio.to_thread(
+        generate_report,
         summaries=creator_summaries,
         payout_units=processed_units,
         exceptions=all_exceptions,
@@ -237,7 +317,7 @@ async def calculate_payouts(request: CalculateRequest):
     )
 
     filename = os.path.basename(filepath)
-    logger.info(f"  Report saved: {filename}")
+    logger.info("  Report saved: %s", filename)
 
     # ------------------------------------------------------------------
     # Step 8: Build and return response
@@ -252,8 +332,8 @@ async def calculate_payouts(request: CalculateRequest):
         "total_exceptions": len(all_exceptions),
     }
 
-    logger.info(f"Pipeline complete: {summary}")
-    logger.info(f"=" * 60)
+    logger.info("Pipeline complete: %s", summary)
+    logger.info(_BANNER)
 
     return CalculateResponse(
         status="success",
@@ -262,10 +342,31 @@ async def calculate_payouts(request: CalculateRequest):
     )
 
 
+# ===========================================================================
+# POST /api/creator-mapping/refresh — Drop the cached Google Sheet mapping
+# ===========================================================================
+
+@app.post("/api/creator-mapping/refresh")
+async def refresh_creator_mapping():
+    """
+    Invalidate the cached creator mapping.
+
+    The next /api/calculate call re-downloads the Google Sheet instead of
+    waiting for the cache TTL to expire (use after editing the sheet).
+    """
+    invalidate_creator_mapping_cache()
+    return {"status": "success"}
+
+
 # ===========================================================================
 # GET /api/download/{filename} — Serve generated .xlsx files
 # ===========================================================================
 
+# Read/send the file in 256 KB chunks (Starlette's default is 64 KB)
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
 @app.get("/api/download/{filename}")
 async def download_report(filename: str):
     """
@@ -273,10 +374,21 @@ async def download_report(filename: str):
 
     Sets Content-Disposition header for browser download.
     Returns 404 if the file doesn't exist.
+
+    The file is streamed in DOWNLOAD_CHUNK_SIZE chunks (or handed to the
+    server's sendfile/pathsend path where supported), so memory stays flat
+    regardless of report size. ETag and Last-Modified headers come from the
+    one os.stat() of the file, which also catches reports deleted from disk
+    (tmp cleanup, manual purge).
     """
     file_path = os.path.join(config.OUTPUT_DIR, filename)
 
-    if not os.path.exists(file_path):
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        stat_result = None
+
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(
             status_code=404,
             detail={
@@ -285,13 +397,16 @@ async def download_report(filename: str):
             },
         )
 
-    return FileResponse(
+    response = FileResponse(
         file_path,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        media_type=XLSX_MEDIA_TYPE,
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"',
         },
+        stat_result=stat_result,
     )
+    response.chunk_size = DOWNLOAD_CHUNK_SIZE
+    return response
 
 
 # ===========================================================================
@@ -322,26 +437,21 @@ def _count_exceptions_per_creator(
     Returns:
         {creator_name: exception_count}
     """
-    counts: dict[str, int] = {}
-
-    for exc in exceptions:
-        # Try to resolve username → creator_name
-        normalized = exc.username.strip().lower()
-        creator_name = None
-
-        if exc.platform == "tiktok":
-            creator_name = tiktok_map.get(normalized)
-        elif exc.platform == "instagram":
-            creator_name = instagram_map.get(normalized)
-
-        if creator_name:
-            counts[creator_name] = counts.get(creator_name, 0) + 1
-        else:
-            # Unmappable exception — still in Tab 3 but no creator to count under
-            logger.debug(
-                f"Exception for unmappable user '{exc.username}' "
-                f"({exc.platform}): {exc.reason}"
-            )
+    # Dispatch on platform once per exception via pre-bound dict.get lookups;
+    # unknown platforms resolve through an empty mapping (→ None)
+    lookups = {"tiktok": tiktok_map.get, "instagram": instagram_map.get}
+    no_creator = {}.get
+
+    resolved = [
+        lookups.get(exc.platform, no_creator)(exc.normalized_username)
+        for exc in exceptions
+    ]
+    counts = Counter(name for name in resolved if name)
+
+    # Unmappable exceptions — still in Tab 3 but no creator to count under
+    unmapped = len(resolved) - counts.total()
+    if unmapped:
+        logger.debug("%d exception(s) for unmappable users not counted", unmapped)
 
     return counts
 
@@ -10,6 +10,7 @@ Models:
   - CalculateRequest / CalculateResponse: API request/response models
 """
 
+from functools import cached_property
 from pydantic import BaseModel
 from datetime import date, datetime
 from typing import Optional
@@ -36,6 +37,11 @@ class Video(BaseModel):
     # Set during processing (Step 5 — creator mapping)
     creator_name: Optional[str] = None
 
+    @cached_property
+    def normalized_username(self) -> str:
+        """username stripped + lowercased — the key format of the handle maps."""
+        return self.username.strip().lower()
+
 
 # ---------------------------------------------------------------------------
 # Creator — one row from the creator mapping Google Sheet
@@ -98,6 +104,36 @@ class ExceptionVideo(BaseModel):
     video_length: Optional[int] = None
     reason: str  # e.g., "Not in creator status list", "Video unavailable", etc.
 
+    @cached_property
+    def normalized_username(self) -> str:
+        """username stripped + lowercased — the key format of the handle maps."""
+        return self.username.strip().lower()
+
+    @classmethod
+    def from_video(cls, video: Video, reason: str) -> "ExceptionVideo":
+        """
+        Build an exception row from an already-validated Video.
+
+        Uses model_construct: every field comes from a Video whose types were
+        checked when it was built, so re-validating here is wasted work on the
+        per-video hot path.
+        """
+        exception = cls.model_construct(
+            username=video.username,
+            platform=video.platform,
+            ad_link=video.ad_link,
+            uploaded_at=video.uploaded_at,
+            created_at=video.created_at,
+            latest_views=video.latest_views,
+            video_length=video.video_length,
+            reason=reason,
+        )
+        # Reuse the Video's normalized username if it was already computed
+        # (e.g. during creator mapping) — seeds the cached_property slot
+        if "normalized_username" in video.__dict__:
+            exception.__dict__["normalized_username"] = video.normalized_username
+        return exception
+
 
 # ---------------------------------------------------------------------------
 # API request / response models
@@ -10,18 +10,28 @@ Sheet structure:
   - Column R (index 17): tiktok_handle  ("Tiktok Handle")
   - Rows 0-1 are headers — data starts at row index 2
 
+The parsed result is cached in-process for MAPPING_CACHE_TTL seconds (keyed
+on the sheet URL), so back-to-back payout runs don't re-download the sheet.
+Call invalidate_creator_mapping_cache() to force a re-fetch. Once the TTL
+expires the sheet is re-requested conditionally (ETag / Last-Modified); a
+304 Not Modified reuses the cached mapping without downloading or parsing.
+
 Output:
   - List of Creator objects
   - tiktok_map:   {normalized_handle → creator_name}
   - instagram_map: {normalized_handle → creator_name}
 """
 
+import csv
 import io
 import logging
-from typing import Optional
+import sys
+import threading
+import time
+from operator import itemgetter
+from typing import Iterable, NamedTuple, Optional
 
 import httpx
-import pandas as pd
 
 import config
 from models.schemas import Creator
@@ -36,20 +46,112 @@ COL_INSTAGRAM_HANDLE = 15  # Column P ("Insta Handle")
 COL_TIKTOK_HANDLE = 16     # Column Q ("Tiktok Handle")
 DATA_START_ROW = 2         # Rows 0-1 are headers
 
+SHEET_TIMEOUT = 30.0       # HTTP timeout for the CSV export in seconds
+MAPPING_CACHE_TTL = 300.0  # Seconds a parsed mapping is reused before re-fetching
+
+# Cell values treated as empty — the same markers pandas.read_csv maps to NaN
+# by default, so "N/A"-style placeholders in the sheet keep being ignored.
+NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+})
+
+
+CreatorMapping = tuple[list[Creator], dict[str, str], dict[str, str]]
+
+# HTTP cache validators from the last sheet response, echoed back as
+# conditional request headers on the next fetch
+VALIDATOR_HEADERS = {
+    "ETag": "If-None-Match",
+    "Last-Modified": "If-Modified-Since",
+}
+
+# Last successful fetch:
+#   (sheet_url, fetched_at [time.monotonic()], result, conditional headers)
+_cache: Optional[tuple[str, float, CreatorMapping, dict[str, str]]] = None
+_cache_lock = threading.Lock()
+
 
 # ===========================================================================
 # Public API
 # ===========================================================================
 
-def fetch_creator_mapping() -> tuple[list[Creator], dict[str, str], dict[str, str]]:
+def fetch_creator_mapping(
+    client: Optional[httpx.Client] = None,
+) -> CreatorMapping:
     """
     Fetch and parse the creator mapping Google Sheet.
 
+    Served from the in-process cache when the same sheet URL was fetched
+    less than MAPPING_CACHE_TTL seconds ago. Failed fetches are not cached.
+
+    Args:
+        client: Shared httpx.Client whose pooled connections should be reused.
+                A one-off client is created when omitted.
+
     Returns:
         creators:      List of Creator objects (one per valid row)
         tiktok_map:    {normalized_tiktok_handle: creator_name}
         instagram_map: {normalized_instagram_handle: creator_name}
 
+    Raises:
+        RuntimeError: If the sheet cannot be fetched or parsed.
+    """
+    global _cache
+
+    url = config.CREATOR_SHEET_CSV_URL
+    with _cache_lock:
+        cached = _cache
+    if cached is not None and cached[0] == url:
+        age = time.monotonic() - cached[1]
+        if age < MAPPING_CACHE_TTL:
+            logger.info(f"Creator mapping cache hit (age {age:.0f}s)")
+            return cached[2]
+
+    logger.info("Creator mapping cache miss")
+    stale = cached if cached is not None and cached[0] == url else None
+    result, conditional_headers = _load_creator_mapping(
+        client, stale[3] if stale else None
+    )
+    if result is None:
+        logger.info("Creator mapping sheet unchanged (304), reusing cached mapping")
+        result = stale[2]
+
+    with _cache_lock:
+        _cache = (url, time.monotonic(), result, conditional_headers)
+    return result
+
+
+def invalidate_creator_mapping_cache() -> None:
+    """Drop the cached mapping so the next fetch re-reads the Google Sheet."""
+    global _cache
+
+    with _cache_lock:
+        _cache = None
+    logger.info("Creator mapping cache invalidated")
+
+
+# ===========================================================================
+# Sheet ingestion
+# ===========================================================================
+
+def _load_creator_mapping(
+    client: Optional[httpx.Client] = None,
+    conditional_headers: Optional[dict[str, str]] = None,
+) -> tuple[Optional[CreatorMapping], dict[str, str]]:
+    """
+    Download the sheet and build (creators, tiktok_map, instagram_map).
+
+    Args:
+        client:              Shared httpx.Client (one-off client if omitted)
+        conditional_headers: If-None-Match / If-Modified-Since from the
+                             previous fetch of the same sheet, if any
+
+    Returns:
+        (mapping, conditional_headers) — mapping is None when the sheet is
+        unchanged (304); the headers are to be sent on the next fetch.
+
     Raises:
         RuntimeError: If the sheet cannot be fetched or parsed.
     """
@@ -57,15 +159,23 @@ def fetch_creator_mapping() -> tuple[list[Creator], dict[str, str], dict[str, st
     # Step 1: Fetch the CSV data from Google Sheets
     # ------------------------------------------------------------------
     logger.info("Fetching creator mapping from Google Sheets...")
-    df = _fetch_sheet_csv()
-    logger.info(f"Fetched sheet with {df.shape[0]} rows, {df.shape[1]} columns")
+    sheet = _fetch_sheet_csv(
+        client,
+        conditional_headers,
+        usecols=(COL_CREATOR_NAME, COL_INSTAGRAM_HANDLE, COL_TIKTOK_HANDLE),
+    )
+    if sheet.rows is None:
+        return None, sheet.conditional_headers
+
+    rows, num_columns = sheet.rows, sheet.num_columns
+    logger.info(f"Fetched sheet with {len(rows)} rows, {num_columns} columns")
 
     # ------------------------------------------------------------------
     # Step 2: Validate we have enough columns
     # ------------------------------------------------------------------
-    if df.shape[1] < COL_TIKTOK_HANDLE + 1:
+    if num_columns < COL_TIKTOK_HANDLE + 1:
         raise RuntimeError(
-            f"Google Sheet has only {df.shape[1]} columns, "
+            f"Google Sheet has only {num_columns} columns, "
             f"expected at least {COL_TIKTOK_HANDLE + 1} (through Column Q). "
             "Check that the correct sheet/tab is published."
         )
@@ -79,22 +189,21 @@ def fetch_creator_mapping() -> tuple[list[Creator], dict[str, str], dict[str, st
 
     skipped_no_name = 0
 
-    for row_idx in range(DATA_START_ROW, df.shape[0]):
-        # --- Extract raw values ---
-        raw_name = df.iloc[row_idx, COL_CREATOR_NAME]
-        raw_ig = df.iloc[row_idx, COL_INSTAGRAM_HANDLE]
-        raw_tt = df.iloc[row_idx, COL_TIKTOK_HANDLE]
+    # --- Clean/normalize each needed column in one pass per column ---
+    data_rows = rows[DATA_START_ROW:]
+    raw_names, raw_ig, raw_tt = zip(*data_rows) if data_rows else ((), (), ())
+    names = _clean_string_column(raw_names)
+    ig_handles = _normalize_handle_column(raw_ig)
+    tt_handles = _normalize_handle_column(raw_tt)
 
+    for row_idx, (creator_name, ig_handle, tt_handle) in enumerate(
+        zip(names, ig_handles, tt_handles), start=DATA_START_ROW
+    ):
         # --- Skip rows with empty creator name ---
-        creator_name = _clean_string(raw_name)
         if not creator_name:
             skipped_no_name += 1
             continue
 
-        # --- Normalize handles ---
-        ig_handle = _normalize_handle(raw_ig)
-        tt_handle = _normalize_handle(raw_tt)
-
         # --- Build Creator object ---
         creator = Creator(
             creator_name=creator_name,
@@ -139,23 +248,48 @@ def fetch_creator_mapping() -> tuple[list[Creator], dict[str, str], dict[str, st
         f"{skipped_no_name} rows skipped (no name)"
     )
 
-    return creators, tiktok_map, instagram_map
+    return (creators, tiktok_map, instagram_map), sheet.conditional_headers
 
 
 # ===========================================================================
 # Private helpers
 # ===========================================================================
 
-def _fetch_sheet_csv() -> pd.DataFrame:
+class _SheetCSV(NamedTuple):
+    """Result of _fetch_sheet_csv."""
+    rows: Optional[list]               # None when the sheet is unchanged (304)
+    num_columns: int                   # Widest row in the sheet
+    conditional_headers: dict[str, str]
+
+
+def _fetch_sheet_csv(
+    client: Optional[httpx.Client] = None,
+    conditional_headers: Optional[dict[str, str]] = None,
+    usecols: Optional[tuple[int, ...]] = None,
+) -> _SheetCSV:
     """
     Fetch the Google Sheet as CSV, with SSL workaround for macOS.
 
     The URL in config should already point to the CSV export format:
       ...pub?gid=...&single=true&output=csv
 
-    Returns a pandas DataFrame with NO header row (header=None),
-    so all rows including headers are accessible by integer index.
+    Args:
+        client:              Shared httpx.Client (one-off client if omitted)
+        conditional_headers: If-None-Match / If-Modified-Since to send
+        usecols:             Column indices to keep; other cells are dropped
+                             as each row is read (short rows pad with None)
+
+    Returns:
+        _SheetCSV. rows keep the header rows so every row is accessible by
+        integer index; blank lines are dropped, as pandas did. rows is None
+        when the server answers 304 Not Modified to conditional_headers,
+        which are then returned unchanged.
     """
+    if client is None:
+        # SSL verification disabled (macOS certificate workaround)
+        with httpx.Client(verify=False) as own_client:
+            return _fetch_sheet_csv(own_client, conditional_headers, usecols)
+
     url = config.CREATOR_SHEET_CSV_URL
 
     # Ensure URL uses CSV export format
@@ -168,19 +302,106 @@ def _fetch_sheet_csv() -> pd.DataFrame:
 
     try:
         logger.debug(f"Fetching: {url}")
-        response = httpx.get(url, timeout=30, follow_redirects=True, verify=False)
+        response = client.get(
+            url,
+            headers=conditional_headers or None,
+            timeout=SHEET_TIMEOUT,
+            follow_redirects=True,
+        )
+        if conditional_headers and response.status_code == 304:
+            return _SheetCSV(None, 0, conditional_headers)
         response.raise_for_status()
-        csv_text = response.text
 
-        # Parse CSV — header=None so we get raw row indices
-        df = pd.read_csv(io.StringIO(csv_text), header=None)
-        return df
+        next_headers = {
+            request_header: response.headers[response_header]
+            for response_header, request_header in VALIDATOR_HEADERS.items()
+            if response_header in response.headers
+        }
+
+        # Parse CSV straight from the response bytes — the wrapper decodes
+        # incrementally as csv.reader pulls lines, so no full-size decoded
+        # copy of the sheet is built. Keep header rows for raw row indices.
+        csv_stream = io.TextIOWrapper(
+            io.BytesIO(response.content),
+            encoding=response.encoding or "utf-8",
+            errors="replace",
+            newline="",
+        )
+        reader = csv.reader(csv_stream)
+        if usecols is None:
+            rows = [row for row in reader if row]
+            num_columns = max((len(row) for row in rows), default=0)
+        else:
+            rows, num_columns = _select_columns(reader, usecols)
+        return _SheetCSV(rows, num_columns, next_headers)
 
     except Exception as e:
         logger.error(f"Failed to fetch creator mapping sheet: {e}")
         raise RuntimeError(f"Could not fetch creator mapping: {e}") from e
 
 
+def _select_columns(
+    reader: Iterable[list[str]],
+    usecols: tuple[int, ...],
+) -> tuple[list[tuple], int]:
+    """
+    Keep only the usecols cells of each non-blank CSV row, in a single pass.
+
+    Short rows are padded with None so every kept row has one entry per
+    requested column. Returns (rows, widest row length seen).
+    """
+    width = max(usecols) + 1
+    pick = itemgetter(*usecols)
+    padding = [None] * width
+
+    rows = []
+    num_columns = 0
+    for row in reader:
+        if not row:
+            continue
+        row_length = len(row)
+        if row_length > num_columns:
+            num_columns = row_length
+        if row_length < width:
+            row = row + padding[:width - row_length]
+        picked = pick(row)
+        rows.append(picked if len(usecols) > 1 else (picked,))
+    return rows, num_columns
+
+
+def _normalize_handle_column(values: list) -> list[Optional[str]]:
+    """Apply _normalize_handle to a whole column of raw cell values."""
+    return _map_distinct(_normalize_handle, values)
+
+
+def _clean_string_column(values: list) -> list[Optional[str]]:
+    """Apply _clean_string to a whole column of raw cell values."""
+    return _map_distinct(_clean_string, values)
+
+
+def _map_distinct(func, values: list) -> list[Optional[str]]:
+    """
+    Map func over a column, evaluating it once per distinct raw value.
+
+    Sheet columns are highly repetitive (blank cells, "N/A" placeholders,
+    creators listed on several rows), so results are memoized per raw value
+    and interned — equal names/handles share one string object across the
+    Creator list, the handle maps, and everything keyed on them downstream.
+    """
+    results: dict = {}
+    out = []
+    for value in values:
+        try:
+            out.append(results[value])
+        except KeyError:
+            result = func(value)
+            if result is not None:
+                result = sys.intern(result)
+            results[value] = result
+            out.append(result)
+    return out
+
+
 def _normalize_handle(raw_value) -> Optional[str]:
     """
     Normalize a social media handle for consistent matching.
@@ -193,7 +414,7 @@ def _normalize_handle(raw_value) -> Optional[str]:
 
     Returns None if the handle is empty/NaN.
     """
-    if pd.isna(raw_value):
+    if raw_value is None or raw_value in NA_VALUES:
         return None
 
     handle = str(raw_value).strip()
@@ -215,7 +436,7 @@ def _clean_string(raw_value) -> Optional[str]:
     Clean a string value: convert to str, strip whitespace.
     Returns None if empty or NaN.
     """
-    if pd.isna(raw_value):
+    if raw_value is None or raw_value in NA_VALUES:
         return None
 
     cleaned = str(raw_value).strip()
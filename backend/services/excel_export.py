@@ -15,17 +15,26 @@ Formatting:
   - Currency format for payout columns ($#,##0.00)
   - Comma-separated number format for view counts (#,##0)
   - Sorted per SPEC.md requirements
+
+The workbook is created in openpyxl write-only mode: each row is serialized
+to the sheet XML as soon as it is appended, so no per-cell object model is
+kept in memory. Column widths, frozen panes and number formats are therefore
+decided BEFORE any row is written.
 """
 
 import os
 import logging
+import tempfile
 from datetime import date, datetime
 from typing import Optional
+from zipfile import ZIP_DEFLATED, ZipFile
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, numbers
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.writer.excel import ExcelWriter
 
 import config
 from models.schemas import CreatorSummary, PayoutUnit, ExceptionVideo
@@ -37,9 +46,14 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 MIN_COL_WIDTH = 10      # Minimum column width (characters)
 MAX_COL_WIDTH = 50      # Maximum column width (avoid super-wide columns)
+WIDTH_SAMPLE_ROWS = 500 # Data rows examined when auto-fitting column widths
 HEADER_FONT = Font(bold=True)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
 CURRENCY_FORMAT = '$#,##0.00'
 NUMBER_FORMAT = '#,##0'
+DATE_FORMAT = 'yyyy-mm-dd'
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+ZIP_COMPRESSLEVEL = 1   # DEFLATE level for the .xlsx archive (fastest)
 
 
 # ===========================================================================
@@ -86,13 +100,12 @@ def generate_report(
     logger.info(f"Generating report: {filepath}")
 
     # ------------------------------------------------------------------
-    # Create workbook and tabs
+    # Create workbook (write-only — rows stream straight to the file) and tabs
     # ------------------------------------------------------------------
-    wb = Workbook()
+    wb = Workbook(write_only=True)
 
-    # Tab 1: Creator Payout Summary (default sheet, rename it)
-    ws1 = wb.active
-    ws1.title = "Creator Payout Summary"
+    # Tab 1: Creator Payout Summary
+    ws1 = wb.create_sheet("Creator Payout Summary")
     _build_tab1_creator_summary(ws1, summaries)
 
     # Tab 2: Video Audit
@@ -106,7 +119,7 @@ def generate_report(
     # ------------------------------------------------------------------
     # Save
     # ------------------------------------------------------------------
-    wb.save(filepath)
+    _save_workbook(wb, filepath)
     logger.info(
         f"Report saved: {filepath} "
         f"({len(summaries)} creators, {len(payout_units)} payout units, "
@@ -143,36 +156,34 @@ def _build_tab1_creator_summary(
         "Paired Video Count",
         "Exception Count",
     ]
-    ws.append(headers)
 
     # ------------------------------------------------------------------
     # Data rows — sorted by total_payout descending
     # ------------------------------------------------------------------
     sorted_summaries = sorted(summaries, key=lambda s: s.total_payout, reverse=True)
 
-    for s in sorted_summaries:
-        ws.append([
+    rows = [
+        (
             s.creator_name,
             s.qualified_video_count,
             s.total_payout,
             s.paired_video_count,
             s.exception_count,
-        ])
+        )
+        for s in sorted_summaries
+    ]
 
     # ------------------------------------------------------------------
-    # Formatting
+    # Formatting: currency for Total Payout (C), numbers for counts (B, D, E)
     # ------------------------------------------------------------------
-    _format_header_row(ws)
-    _freeze_top_row(ws)
+    col_formats = {
+        2: NUMBER_FORMAT,
+        3: CURRENCY_FORMAT,
+        4: NUMBER_FORMAT,
+        5: NUMBER_FORMAT,
+    }
 
-    # Currency format for Total Payout column (column C = index 3)
-    _apply_column_format(ws, col_idx=3, fmt=CURRENCY_FORMAT, start_row=2)
-
-    # Number format for count columns (columns B, D, E)
-    for col_idx in [2, 4, 5]:
-        _apply_column_format(ws, col_idx=col_idx, fmt=NUMBER_FORMAT, start_row=2)
-
-    _auto_fit_columns(ws)
+    _write_sheet(ws, headers, rows, col_formats)
 
 
 # ===========================================================================
@@ -212,27 +223,27 @@ def _build_tab2_video_audit(
         "Match Notes",
         "Latest Updated At",
     ]
-    ws.append(headers)
 
     # ------------------------------------------------------------------
     # Data rows — sorted by Creator Name, then Uploaded At
     # ------------------------------------------------------------------
     sorted_units = sorted(payout_units, key=_tab2_sort_key)
 
+    rows = []
     for pu in sorted_units:
+        uploaded_at = _get_uploaded_at(pu)
         # Both videos are always present (only paired units reach Tab 2)
         tt_link = pu.tiktok_video.ad_link
         tt_views = pu.tiktok_video.latest_views
         ig_link = pu.instagram_video.ad_link
         ig_views = pu.instagram_video.latest_views
 
-        uploaded_at = _get_uploaded_at(pu)
         video_length = _get_video_length(pu)
         latest_updated = _get_latest_updated_at(pu)
 
-        ws.append([
+        rows.append((
             pu.creator_name,
-            _format_date(uploaded_at),
+            uploaded_at,
             video_length,
             tt_link,
             tt_views,
@@ -243,23 +254,24 @@ def _build_tab2_video_audit(
             pu.payout_amount,
             pu.match_method,
             pu.match_note,
-            _format_datetime(latest_updated),
-        ])
+            _excel_datetime(latest_updated),
+        ))
 
     # ------------------------------------------------------------------
-    # Formatting
+    # Formatting: native dates for Uploaded At (B) and Latest Updated At (M),
+    # views with comma separators (E, G, H, I), currency for Payout Amount (J)
     # ------------------------------------------------------------------
-    _format_header_row(ws)
-    _freeze_top_row(ws)
-
-    # Views columns with comma separators (E=5, G=7, H=8, I=9)
-    for col_idx in [5, 7, 8, 9]:
-        _apply_column_format(ws, col_idx=col_idx, fmt=NUMBER_FORMAT, start_row=2)
+    col_formats = {
+        2: DATE_FORMAT,
+        5: NUMBER_FORMAT,
+        7: NUMBER_FORMAT,
+        8: NUMBER_FORMAT,
+        9: NUMBER_FORMAT,
+        10: CURRENCY_FORMAT,
+        13: DATETIME_FORMAT,
+    }
 
-    # Currency format for Payout Amount (column J = 10)
-    _apply_column_format(ws, col_idx=10, fmt=CURRENCY_FORMAT, start_row=2)
-
-    _auto_fit_columns(ws)
+    _write_sheet(ws, headers, rows, col_formats)
 
 
 # ===========================================================================
@@ -291,97 +303,173 @@ def _build_tab3_exceptions(
         "Video Length (sec)",
         "Reason",
     ]
-    ws.append(headers)
 
     # ------------------------------------------------------------------
     # Data rows
     # ------------------------------------------------------------------
-    for exc in exceptions:
-        ws.append([
+    rows = [
+        (
             exc.username,
             exc.platform,
             exc.ad_link,
-            _format_date(exc.uploaded_at),
+            exc.uploaded_at,
             exc.latest_views,
             exc.video_length,
             exc.reason,
-        ])
+        )
+        for exc in exceptions
+    ]
 
     # ------------------------------------------------------------------
-    # Formatting
+    # Formatting: native date for Uploaded At (D), views column with
+    # comma separators (E)
     # ------------------------------------------------------------------
-    _format_header_row(ws)
-    _freeze_top_row(ws)
+    col_formats = {4: DATE_FORMAT, 5: NUMBER_FORMAT}
 
-    # Views column with comma separators (column E = 5)
-    _apply_column_format(ws, col_idx=5, fmt=NUMBER_FORMAT, start_row=2)
-
-    _auto_fit_columns(ws)
+    _write_sheet(ws, headers, rows, col_formats)
 
 
 # ===========================================================================
 # Formatting helpers
 # ===========================================================================
 
-def _format_header_row(ws: Worksheet) -> None:
-    """Bold the entire header row (row 1)."""
-    for cell in ws[1]:
-        cell.font = HEADER_FONT
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+def _write_sheet(
+    ws: Worksheet,
+    headers: list[str],
+    rows: list[tuple],
+    col_formats: dict[int, str],
+) -> None:
+    """
+    Write the header row and all data rows to a write-only worksheet.
 
+    Write-only sheets emit the sheet header (column widths, frozen panes)
+    on the first append, so those are applied before any row is written.
 
-def _freeze_top_row(ws: Worksheet) -> None:
-    """Freeze the top row so the header stays visible when scrolling."""
-    ws.freeze_panes = "A2"
+    Args:
+        ws:          Write-only worksheet
+        headers:     Header labels (row 1)
+        rows:        Data rows, one tuple of plain values per row
+        col_formats: {1-based column index: number format} for data cells
+    """
+    _set_column_widths(ws, headers, rows)
+    _freeze_top_row(ws)
+
+    ws.append(_header_cells(ws, headers))
+    _append_rows(ws, rows, col_formats)
 
 
-def _apply_column_format(
+def _header_cells(ws: Worksheet, headers: list[str]) -> list[WriteOnlyCell]:
+    """Build the bold, centered header row (row 1)."""
+    cells = []
+    for label in headers:
+        cell = WriteOnlyCell(ws, value=label)
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+
+def _append_rows(
     ws: Worksheet,
-    col_idx: int,
-    fmt: str,
-    start_row: int = 2,
+    rows: list[tuple],
+    col_formats: dict[int, str],
 ) -> None:
     """
-    Apply a number format to all data cells in a column.
+    Append data rows, attaching number formats to the cells that need one.
 
-    Args:
-        ws:        Worksheet
-        col_idx:   1-based column index
-        fmt:       Number format string (e.g., '$#,##0.00' or '#,##0')
-        start_row: First data row (skip header)
+    Formats are resolved once per sheet; each formatted value gets its
+    own WriteOnlyCell.
+    Unformatted columns and None values are passed through as plain values.
     """
-    for row in range(start_row, ws.max_row + 1):
-        cell = ws.cell(row=row, column=col_idx)
-        if cell.value is not None:
-            cell.number_format = fmt
+    formats = [(col_idx - 1, fmt) for col_idx, fmt in sorted(col_formats.items())]
+
+    append = ws.append
+    for row in rows:
+        values = list(row)
+        for pos, fmt in formats:
+            value = values[pos]
+            if value is not None:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.number_format = fmt
+                values[pos] = cell
+        append(values)
+
 
+def _freeze_top_row(ws: Worksheet) -> None:
+    """Freeze the top row so the header stays visible when scrolling."""
+    ws.freeze_panes = "A2"
 
-def _auto_fit_columns(ws: Worksheet) -> None:
+
+def _set_column_widths(
+    ws: Worksheet,
+    headers: list[str],
+    rows: list[tuple],
+) -> None:
     """
     Auto-fit column widths based on cell content.
 
-    Examines header + all data rows to find the widest value in each column,
-    then sets the column width with min/max constraints.
+    Estimates each column's width from the header plus the first
+    WIDTH_SAMPLE_ROWS data rows (widths are capped at MAX_COL_WIDTH anyway,
+    so scanning every row of a large tab buys nothing), then sets the
+    column width with min/max constraints.
     """
-    for col_idx in range(1, ws.max_column + 1):
-        max_length = 0
-        col_letter = get_column_letter(col_idx)
-
-        for row in range(1, ws.max_row + 1):
-            cell = ws.cell(row=row, column=col_idx)
-            if cell.value is not None:
-                # Estimate width from string representation
-                cell_text = str(cell.value)
-                cell_length = len(cell_text)
-                if cell_length > max_length:
-                    max_length = cell_length
-
+    max_lengths = [len(str(h)) for h in headers]
+
+    # Text lengths are taken directly; other values are sized by their str()
+    # form, memoized since numbers/dates repeat heavily within a column
+    str_lengths: dict[tuple[type, object], int] = {}
+
+    for row in rows[:WIDTH_SAMPLE_ROWS]:
+        for col_idx, value in enumerate(row):
+            if value is None:
+                continue
+            if isinstance(value, str):
+                cell_length = len(value)
+            else:
+                key = (type(value), value)
+                cell_length = str_lengths.get(key)
+                if cell_length is None:
+                    cell_length = str_lengths[key] = len(str(value))
+            if cell_length > max_lengths[col_idx]:
+                max_lengths[col_idx] = cell_length
+
+    for col_idx, max_length in enumerate(max_lengths, 1):
         # Apply width with padding and constraints
         # Add 2 chars of padding for readability
         adjusted_width = max_length + 2
         adjusted_width = max(adjusted_width, MIN_COL_WIDTH)
         adjusted_width = min(adjusted_width, MAX_COL_WIDTH)
-        ws.column_dimensions[col_letter].width = adjusted_width
+        ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
+
+
+def _save_workbook(wb: Workbook, filepath: str) -> None:
+    """
+    Package the workbook into the .xlsx zip at a fast DEFLATE level.
+
+    Same as wb.save() except for ZIP_COMPRESSLEVEL: level 1 compresses the
+    sheet XML several times faster than zlib's default level 6, for a
+    slightly larger file. Any DEFLATE level is valid xlsx.
+
+    The zip is written to a temp file in the same directory and then
+    os.replace()d onto filepath. Reports run off the event loop, so two
+    runs for the same period can save concurrently; the rename means each
+    one lands whole and /api/download never serves a half-written file.
+    """
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(filepath), prefix=".", suffix=".xlsx"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f, ZipFile(
+            f, "w", ZIP_DEFLATED, allowZip64=True, compresslevel=ZIP_COMPRESSLEVEL
+        ) as archive:
+            ExcelWriter(wb, archive).save()
+        os.replace(temp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
 
 
 # ===========================================================================
@@ -432,18 +520,16 @@ def _tab2_sort_key(pu: PayoutUnit) -> tuple:
 # Date formatting helpers
 # ===========================================================================
 
-def _format_date(d: Optional[date]) -> Optional[str]:
-    """Format a date as YYYY-MM-DD, or None if missing."""
-    if d is None:
-        return None
-    return d.isoformat()
-
+def _excel_datetime(dt: Optional[datetime]) -> Optional[datetime]:
+    """
+    Prepare a datetime for a native Excel date cell.
 
-def _format_datetime(dt: Optional[datetime]) -> Optional[str]:
-    """Format a datetime as YYYY-MM-DD HH:MM:SS, or None if missing."""
+    Excel has no time zones, so the offset is dropped (keeping the wall-clock
+    time the report always showed), along with sub-second precision.
+    """
     if dt is None:
         return None
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    return dt.replace(tzinfo=None, microsecond=0)
 
 
 # ===========================================================================
@@ -1,21 +1,27 @@
 """
 First frame extraction and perceptual hash comparison for cross-platform video matching.
 
-Uses yt-dlp to download videos and ffmpeg to extract the first frame,
-then computes perceptual hashes (phash) via imagehash for comparison.
+Uses yt-dlp to resolve (or, for TikTok, download) videos and ffmpeg to
+extract the first frame, then computes perceptual hashes (phash) via
+imagehash for comparison. URL resolution and temp-file downloads run the
+yt_dlp library in-process; only the download-to-pipe path spawns the CLI.
 
-Memory-efficient: images are discarded immediately after computing phash.
-Only the 64-bit hash is cached, not the full 720x1280 PIL Image (~2.7MB each).
+Memory-efficient: ffmpeg downscales frame 0 to the 32x32 grayscale image
+phash works on, so Python never holds the full 720x1280 frame (~2.7MB).
+Only the 64-bit hash is cached.
 
 Functions:
   extract_first_frame(ad_link) -> Image | None
-      Download video, extract frame 0, return as PIL Image.
+      Stream (or download) video, return frame 0 as a 32x32 grayscale Image.
 
   extract_phash(ad_link) -> ImageHash | None
       Download video, extract frame, compute phash, discard image.
 
   get_phash(ad_link, cache) -> ImageHash | None
-      Cached wrapper around extract_phash.
+      Cached wrapper around extract_phash (memory, then on-disk cache).
+
+  prefetch_phashes(ad_links, cache, workers=8) -> None
+      Load/extract phashes for many links concurrently into the cache.
 
   compare_hashes(h1, h2) -> int
       Hamming distance between two phash values.
@@ -23,21 +29,34 @@ Functions:
   is_same_video(h1, h2, threshold=10) -> bool
       True if hamming distance <= threshold.
 
-Performance: ~1.8 seconds per video. Both TikTok and Instagram
-produce 720x1280 first frames — no normalization needed.
+  phash_to_int(h) -> int / hamming_distance(a, b) -> int
+      Packed 64-bit form for comparing one hash against many candidates.
+
+Performance: ~1.8 seconds per video (mostly subprocess wall-time, so
+prefetch_phashes overlaps extractions in a thread pool). Both TikTok and
+Instagram frames are normalized to 32x32 grayscale by ffmpeg.
 """
 
 import logging
-import shutil
+import os
 import subprocess
 import tempfile
-from pathlib import Path
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+from urllib.parse import urlparse
 
 import imagehash
+import numpy as np
 from PIL import Image
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadError
+
+from config import PHASH_EXTRACTION_WORKERS
+from services.phash_cache import load_phashes, store_phashes
 
 logger = logging.getLogger(__name__)
+ytdlp_logger = logger.getChild("yt_dlp")
 
 # ---------------------------------------------------------------------------
 # Timeouts for subprocess calls
@@ -45,125 +64,349 @@ logger = logging.getLogger(__name__)
 YTDLP_TIMEOUT = 60   # seconds
 FFMPEG_TIMEOUT = 15   # seconds
 
+# ---------------------------------------------------------------------------
+# yt-dlp settings. URL resolution and temp-file downloads use the yt_dlp
+# library in-process (no interpreter start-up per video). socket_timeout only
+# bounds idle reads, so temp-file downloads also get a YTDLP_TIMEOUT
+# wall-clock deadline (see _deadline_hook) and a file size cap
+# ---------------------------------------------------------------------------
+YTDLP_FORMAT = "best[ext=mp4]/best"
+YTDLP_SOCKET_TIMEOUT = 20  # seconds
+YTDLP_MAX_FILESIZE = 200 * 1024 * 1024  # bytes; short-form videos are far smaller
+
+# Bytes of subprocess stderr kept for failure logs
+STDERR_TAIL_BYTES = 512
+
+# ---------------------------------------------------------------------------
+# phash resizes its input to 32x32 grayscale (hash_size 8 x highfreq_factor 4)
+# before the DCT; ffmpeg does that downscale instead and writes the 1024 raw
+# 8-bit pixels to stdout — no image codec, no frame file, no Pillow resize
+# ---------------------------------------------------------------------------
+PHASH_FRAME_SIZE = 32
+FRAME_BYTES = PHASH_FRAME_SIZE * PHASH_FRAME_SIZE
+PHASH_HASH_SIZE = 8
+
+# Rows 0-7 of the unnormalized DCT-II basis over 32 samples (the transform
+# scipy.fftpack.dct applies inside imagehash.phash). phash keeps only the
+# top-left 8x8 coefficients, so B @ pixels @ B.T yields exactly those
+_DCT_BASIS = 2 * np.cos(
+    np.pi
+    * np.arange(PHASH_HASH_SIZE)[:, None]
+    * (2 * np.arange(PHASH_FRAME_SIZE)[None, :] + 1)
+    / (2 * PHASH_FRAME_SIZE)
+)
+
+# ffmpeg output options: decode only frame 0, downscale it for phash and
+# emit it as raw grayscale on stdout
+FFMPEG_FRAME_TO_STDOUT = (
+    "-vframes", "1",
+    "-vf", f"scale={PHASH_FRAME_SIZE}:{PHASH_FRAME_SIZE}:flags=lanczos,format=gray",
+    "-f", "rawvideo",
+    "-pix_fmt", "gray",
+    "pipe:1",
+)
+
+# ---------------------------------------------------------------------------
+# CDNs that reject direct ffmpeg reads — these always download with yt-dlp
+# ---------------------------------------------------------------------------
+DOWNLOAD_ONLY_DOMAINS = ("tiktok.com",)
+
 # ---------------------------------------------------------------------------
 # Perceptual hash threshold — same video = distance 0-10, different = 30+
 # ---------------------------------------------------------------------------
 PHASH_THRESHOLD = 10
 
+# ---------------------------------------------------------------------------
+# Concurrent extractions in prefetch_phashes — each one is a yt-dlp download
+# plus an ffmpeg decode in subprocesses, so threads overlap them fine. The
+# work is network-bound, so hosts with more bandwidth can raise it via the
+# PHASH_EXTRACTION_WORKERS env var.
+# ---------------------------------------------------------------------------
+MAX_EXTRACTION_WORKERS = max(1, PHASH_EXTRACTION_WORKERS)
+
+# Marks "not in the per-run cache" in get_phash (None means extraction failed)
+_CACHE_MISS = object()
+
 
 # ===========================================================================
-# System dependency checks
+# First frame extraction
 # ===========================================================================
 
-def check_dependencies() -> tuple[bool, list[str]]:
+def extract_first_frame(ad_link: str) -> Optional[Image.Image]:
     """
-    Verify that yt-dlp and ffmpeg are available on the system.
+    Extract the first frame of a video, downscaled for phash.
+
+    Where the CDN allows it, ffmpeg reads frame 0 straight from the
+    resolved media URL, so only the first few hundred KB cross the wire.
+    TikTok CDN returns 403 if ffmpeg accesses the URL directly, so TikTok
+    links (and any stream attempt that fails) are downloaded by yt-dlp and
+    piped into ffmpeg without touching disk. Files ffmpeg cannot decode from
+    a pipe (moov atom at the end) fall back to a temp-file download.
+
+    Args:
+        ad_link: The video URL (TikTok or Instagram)
 
     Returns:
-        (all_ok, missing): True if both found, list of missing tool names.
+        32x32 grayscale PIL Image of the first frame, or None if extraction
+        fails.
     """
-    missing = []
-    if shutil.which("yt-dlp") is None:
-        missing.append("yt-dlp")
-    if shutil.which("ffmpeg") is None:
-        missing.append("ffmpeg")
-    return len(missing) == 0, missing
+    if not _requires_download(ad_link):
+        img = _extract_first_frame_from_stream(ad_link)
+        if img is not None:
+            return img
+        logger.debug(f"Stream extraction failed, downloading instead: {ad_link}")
+
+    img = _extract_first_frame_from_pipe(ad_link)
+    if img is not None:
+        return img
+    logger.debug(f"Piped extraction failed, using temp file: {ad_link}")
 
+    return _extract_first_frame_from_download(ad_link)
 
-# ===========================================================================
-# First frame extraction
-# ===========================================================================
 
-def extract_first_frame(ad_link: str) -> Optional[Image.Image]:
+def _requires_download(ad_link: str) -> bool:
+    """True if the link's CDN rejects direct ffmpeg access."""
+    host = urlparse(ad_link).netloc.lower()
+    return any(
+        host == domain or host.endswith("." + domain)
+        for domain in DOWNLOAD_ONLY_DOMAINS
+    )
+
+
+def _extract_first_frame_from_stream(ad_link: str) -> Optional[Image.Image]:
     """
-    Download a video and extract its first frame as a PIL Image.
+    Extract frame 0 by letting ffmpeg read the media URL directly.
 
     Process:
-      1. yt-dlp downloads the video to a temp file (handles CDN auth/redirects)
-      2. ffmpeg extracts frame 0 as JPEG
-      3. Open JPEG with Pillow, return Image
-      4. Both temp files cleaned up in finally block
-
-    TikTok CDN returns 403 if ffmpeg accesses the URL directly,
-    so we always download the full video first with yt-dlp.
+      1. yt-dlp resolves the signed CDN URL in-process (no download)
+      2. ffmpeg decodes only the first frame and writes raw pixels to stdout
+      3. Pillow wraps the pixel bytes in memory — no temp files
 
     Args:
-        ad_link: The video URL (TikTok or Instagram)
+        ad_link: The video URL
 
     Returns:
-        PIL Image of the first frame, or None if extraction fails.
+        PIL Image of the first frame, or None if any step fails.
     """
-    temp_video_path = None
-    temp_frame_path = None
-
     try:
-        # Create temp files
-        temp_dir = tempfile.mkdtemp(prefix="payout_frame_")
-        temp_video_path = str(Path(temp_dir) / "video.mp4")
-        temp_frame_path = str(Path(temp_dir) / "frame.jpg")
-
-        # --- Step 1: Download video with yt-dlp ---
-        ytdlp_cmd = [
-            "yt-dlp",
-            "-f", "best[ext=mp4]/best",
-            "-o", temp_video_path,
-            ad_link,
-        ]
-
-        logger.debug(f"Downloading video: {ad_link}")
+        with YoutubeDL(_ytdlp_options()) as ydl:
+            info = ydl.extract_info(ad_link, download=False)
+        media_url = (info or {}).get("url")
+        if not media_url:
+            logger.debug(f"yt-dlp resolved no media URL for {ad_link}")
+            return None
+
         result = subprocess.run(
-            ytdlp_cmd,
+            ["ffmpeg", "-loglevel", "error", "-i", media_url, *FFMPEG_FRAME_TO_STDOUT],
+            stdin=subprocess.DEVNULL,  # ffmpeg polls stdin for keys otherwise
             capture_output=True,
-            text=True,
-            timeout=YTDLP_TIMEOUT,
+            timeout=FFMPEG_TIMEOUT,
         )
+        if result.returncode != 0 or not result.stdout:
+            logger.debug(
+                f"ffmpeg stream read failed for {ad_link}: "
+                f"{_stderr_tail(result.stderr)}"
+            )
+            return None
 
-        if result.returncode != 0:
-            logger.warning(
-                f"yt-dlp failed for {ad_link}: {result.stderr[:200]}"
+        img = _open_frame(result.stdout)
+        logger.debug(f"Frame streamed: {ad_link} ({img.size})")
+        return img
+
+    except subprocess.TimeoutExpired:
+        logger.debug(f"Timeout streaming frame from {ad_link}")
+        return None
+    except Exception as e:
+        logger.debug(f"Stream extraction failed for {ad_link}: {e}")
+        return None
+
+
+def _extract_first_frame_from_pipe(ad_link: str) -> Optional[Image.Image]:
+    """
+    Extract frame 0 by piping yt-dlp's download straight into ffmpeg.
+
+    yt-dlp handles the CDN auth and writes the video to stdout; ffmpeg reads
+    it from stdin and writes the first frame's raw pixels to stdout. Once ffmpeg
+    has its frame it exits and the rest of the download is abandoned.
+
+    Args:
+        ad_link: The video URL
+
+    Returns:
+        PIL Image of the first frame, or None if any step fails.
+    """
+    downloader = None
+    decoder = None
+    try:
+        downloader = subprocess.Popen(
+            [
+                "yt-dlp", "--quiet", "--no-progress",
+                "-f", YTDLP_FORMAT,
+                "-o", "-",
+                ad_link,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        decoder = subprocess.Popen(
+            ["ffmpeg", "-loglevel", "error", "-i", "pipe:0", *FFMPEG_FRAME_TO_STDOUT],
+            stdin=downloader.stdout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        downloader.stdout.close()  # ffmpeg owns the read end now
+
+        frame_bytes, stderr = decoder.communicate(
+            timeout=YTDLP_TIMEOUT + FFMPEG_TIMEOUT
+        )
+        if decoder.returncode != 0 or not frame_bytes:
+            logger.debug(
+                f"ffmpeg pipe read failed for {ad_link}: {_stderr_tail(stderr)}"
             )
             return None
 
-        # Verify video file exists
-        if not Path(temp_video_path).exists():
-            # yt-dlp may add an extension — find the actual file
-            video_files = list(Path(temp_dir).glob("video.*"))
-            if video_files:
-                temp_video_path = str(video_files[0])
-            else:
+        img = _open_frame(frame_bytes)
+        logger.debug(f"Frame piped: {ad_link} ({img.size})")
+        return img
+
+    except subprocess.TimeoutExpired:
+        logger.debug(f"Timeout piping frame from {ad_link}")
+        return None
+    except Exception as e:
+        logger.debug(f"Piped extraction failed for {ad_link}: {e}")
+        return None
+    finally:
+        for process in (decoder, downloader):
+            if process is not None and process.poll() is None:
+                process.kill()
+            if process is not None:
+                process.wait()
+
+
+def _ytdlp_options(**overrides) -> dict:
+    """Options for an in-process YoutubeDL: quiet, same format as the CLI path."""
+    options = {
+        "format": YTDLP_FORMAT,
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,
+        "socket_timeout": YTDLP_SOCKET_TIMEOUT,
+        "logger": ytdlp_logger,
+    }
+    options.update(overrides)
+    return options
+
+
+def _deadline_hook(timeout: float):
+    """
+    Build a yt-dlp progress hook that aborts a download after `timeout` seconds.
+
+    A slow but steady download never trips socket_timeout, so without this an
+    in-process download has no upper bound. The hook runs on every progress
+    update; raising DownloadError there aborts the download, and the caller's
+    existing DownloadError handling treats it as a failed extraction.
+    """
+    deadline = time.monotonic() + timeout
+
+    def hook(progress: dict) -> None:
+        if progress.get("status") == "downloading" and time.monotonic() > deadline:
+            raise DownloadError(f"download exceeded {timeout}s deadline")
+
+    return hook
+
+
+def _open_frame(raw_bytes: bytes) -> Image.Image:
+    """
+    Wrap ffmpeg's raw 32x32 grayscale output in a PIL Image.
+
+    Raises:
+        ValueError: If ffmpeg emitted fewer bytes than one frame.
+    """
+    if len(raw_bytes) < FRAME_BYTES:
+        raise ValueError(f"short frame: {len(raw_bytes)} of {FRAME_BYTES} bytes")
+    return Image.frombytes(
+        "L", (PHASH_FRAME_SIZE, PHASH_FRAME_SIZE), raw_bytes[:FRAME_BYTES]
+    )
+
+
+def _stderr_tail(stderr: Optional[bytes]) -> str:
+    """Decode the end of a subprocess's stderr for logging (errors come last)."""
+    if not stderr:
+        return ""
+    return stderr[-STDERR_TAIL_BYTES:].decode("utf-8", "replace").strip()
+
+
+def _extract_first_frame_from_download(ad_link: str) -> Optional[Image.Image]:
+    """
+    Download a video and extract its first frame as a PIL Image.
+
+    Process:
+      1. yt-dlp (in-process) downloads the video to a temp file
+         (handles CDN auth/redirects)
+      2. ffmpeg extracts frame 0, downscaled, as raw pixels on stdout
+      3. Wrap the pixels in a PIL Image and return it
+      4. Temp directory removed when the with-block exits
+
+    Args:
+        ad_link: The video URL (TikTok or Instagram)
+
+    Returns:
+        PIL Image of the first frame, or None if extraction fails.
+    """
+    try:
+        with tempfile.TemporaryDirectory(
+            prefix="payout_frame_", ignore_cleanup_errors=True
+        ) as temp_dir:
+            # Fixed output name (no %(ext)s in the template), so yt-dlp writes
+            # exactly this path whatever container it picks
+            temp_video_path = os.path.join(temp_dir, "video.mp4")
+
+            # --- Step 1: Download video with yt-dlp ---
+            logger.debug(f"Downloading video: {ad_link}")
+            try:
+                download_options = _ytdlp_options(
+                    outtmpl=temp_video_path,
+                    max_filesize=YTDLP_MAX_FILESIZE,
+                    progress_hooks=[_deadline_hook(YTDLP_TIMEOUT)],
+                )
+                with YoutubeDL(download_options) as ydl:
+                    ydl.download([ad_link])
+            except DownloadError as e:
+                logger.warning(f"yt-dlp failed for {ad_link}: {str(e)[-200:]}")
+                return None
+
+            if not os.path.exists(temp_video_path):
                 logger.warning(f"yt-dlp produced no output file for {ad_link}")
                 return None
 
-        # --- Step 2: Extract first frame with ffmpeg ---
-        ffmpeg_cmd = [
-            "ffmpeg",
-            "-y",
-            "-i", temp_video_path,
-            "-vframes", "1",
-            "-q:v", "2",
-            temp_frame_path,
-        ]
-
-        logger.debug(f"Extracting first frame: {ad_link}")
-        result = subprocess.run(
-            ffmpeg_cmd,
-            capture_output=True,
-            text=True,
-            timeout=FFMPEG_TIMEOUT,
-        )
+            # --- Step 2: Extract first frame with ffmpeg ---
+            ffmpeg_cmd = [
+                "ffmpeg",
+                "-loglevel", "error",
+                "-i", temp_video_path,
+                *FFMPEG_FRAME_TO_STDOUT,
+            ]
+
+            logger.debug(f"Extracting first frame: {ad_link}")
+            result = subprocess.run(
+                ffmpeg_cmd,
+                stdin=subprocess.DEVNULL,  # ffmpeg polls stdin for keys otherwise
+                capture_output=True,
+                timeout=FFMPEG_TIMEOUT,
+            )
 
         if result.returncode != 0:
             logger.warning(
-                f"ffmpeg failed for {ad_link}: {result.stderr[:200]}"
+                f"ffmpeg failed for {ad_link}: {_stderr_tail(result.stderr)}"
             )
             return None
 
-        # --- Step 3: Open frame with Pillow ---
-        if not Path(temp_frame_path).exists():
+        # --- Step 3: Wrap frame pixels ---
+        if not result.stdout:
             logger.warning(f"ffmpeg produced no frame for {ad_link}")
             return None
 
-        img = Image.open(temp_frame_path).copy()  # .copy() to detach from file
+        img = _open_frame(result.stdout)
         logger.debug(f"Frame extracted: {ad_link} ({img.size})")
         return img
 
@@ -173,14 +416,6 @@ def extract_first_frame(ad_link: str) -> Optional[Image.Image]:
     except Exception as e:
         logger.warning(f"Frame extraction failed for {ad_link}: {e}")
         return None
-    finally:
-        # --- Step 4: Clean up temp files ---
-        if temp_video_path:
-            temp_dir = str(Path(temp_video_path).parent)
-            try:
-                shutil.rmtree(temp_dir, ignore_errors=True)
-            except Exception:
-                pass
 
 
 # ===========================================================================
@@ -191,9 +426,8 @@ def extract_phash(ad_link: str) -> Optional[imagehash.ImageHash]:
     """
     Download a video, extract first frame, compute phash, discard image.
 
-    This is the memory-efficient alternative to extract_first_frame().
-    The PIL Image (~2.7MB at 720x1280) is discarded immediately after
-    computing the 64-bit phash.
+    The frame is already 32x32 grayscale, so the hash is computed directly
+    from its pixels (see _phash_pixels); the image is discarded right after.
 
     Args:
         ad_link: The video URL (TikTok or Instagram)
@@ -204,12 +438,28 @@ def extract_phash(ad_link: str) -> Optional[imagehash.ImageHash]:
     img = extract_first_frame(ad_link)
     if img is None:
         return None
-    phash = imagehash.phash(img)
+    phash = _phash_pixels(img)
     # Image is discarded when it goes out of scope here
     del img
     return phash
 
 
+def _phash_pixels(img: Image.Image) -> imagehash.ImageHash:
+    """
+    imagehash.phash for a frame that is already 32x32 grayscale.
+
+    Skips phash's convert/resize copies and its two full 32x32 DCT passes:
+    only the 8x8 low-frequency block is computed, as two small matrix
+    products. Produces the same hash bits as imagehash.phash(img).
+    """
+    if img.mode != "L" or img.size != (PHASH_FRAME_SIZE, PHASH_FRAME_SIZE):
+        return imagehash.phash(img)
+
+    pixels = np.asarray(img, dtype=np.float64)
+    low_freq = _DCT_BASIS @ pixels @ _DCT_BASIS.T
+    return imagehash.ImageHash(low_freq > np.median(low_freq))
+
+
 # ===========================================================================
 # Perceptual hash comparison
 # ===========================================================================
@@ -252,6 +502,21 @@ def is_same_video(
     return compare_hashes(hash1, hash2) <= threshold
 
 
+def phash_to_int(phash: imagehash.ImageHash) -> int:
+    """
+    Pack a phash into a single int (64 bits for the default 8x8 hash).
+
+    Convert once, then compare with hamming_distance() — much cheaper than
+    ImageHash subtraction when one hash is checked against many candidates.
+    """
+    return int(str(phash), 16)
+
+
+def hamming_distance(bits1: int, bits2: int) -> int:
+    """Hamming distance between two packed phashes (xor + popcount)."""
+    return (bits1 ^ bits2).bit_count()
+
+
 # ===========================================================================
 # Cached phash extraction
 # ===========================================================================
@@ -261,9 +526,12 @@ def get_phash(
     cache: dict[str, Optional[imagehash.ImageHash]],
 ) -> Optional[imagehash.ImageHash]:
     """
-    Extract a video's phash, using a cache to avoid re-downloading.
+    Extract a video's phash, using caches to avoid re-downloading.
 
-    Each video is only downloaded and processed once per pipeline run.
+    Lookup order: the per-run dict, then the persistent on-disk cache
+    (services.phash_cache), then a fresh extraction. Results are written back
+    to disk so later runs skip the download entirely (failures only for a
+    short TTL, so transient errors are retried).
     Cache stores only the 64-bit phash (~100 bytes), not the full image.
 
     Args:
@@ -273,6 +541,59 @@ def get_phash(
     Returns:
         ImageHash of the first frame, or None if extraction failed.
     """
-    if ad_link not in cache:
-        cache[ad_link] = extract_phash(ad_link)
-    return cache[ad_link]
+    # Fast path: one dict probe for the common (prefetched) case. A sentinel
+    # is needed because None is a valid cached value (extraction failed)
+    phash = cache.get(ad_link, _CACHE_MISS)
+    if phash is not _CACHE_MISS:
+        return phash
+
+    stored = load_phashes([ad_link])
+    if ad_link in stored:
+        phash = stored[ad_link]
+    else:
+        phash = extract_phash(ad_link)
+        store_phashes({ad_link: phash})
+    cache[ad_link] = phash
+    return phash
+
+
+def prefetch_phashes(
+    ad_links: Iterable[str],
+    cache: dict[str, Optional[imagehash.ImageHash]],
+    workers: int = MAX_EXTRACTION_WORKERS,
+) -> None:
+    """
+    Load or extract phashes for many videos and store them in the cache.
+
+    Hashes still fresh in the on-disk cache are loaded in one query; the rest
+    are extracted concurrently. Extraction is dominated by yt-dlp/ffmpeg
+    subprocess wall-time, so running up to `workers` at once gives a
+    near-linear speedup. Afterwards every get_phash() call for these links
+    is a cache hit.
+
+    Args:
+        ad_links: Video URLs to extract (duplicates and cached links skipped)
+        cache:    Shared dict[ad_link -> ImageHash | None], filled in place
+        workers:  Maximum concurrent extractions
+    """
+    pending = [link for link in dict.fromkeys(ad_links) if link not in cache]
+    if not pending:
+        return
+
+    stored = load_phashes(pending)
+    cache.update(stored)
+    pending = [link for link in pending if link not in stored]
+    if not pending:
+        logger.info(f"All {len(stored)} phashes loaded from disk cache")
+        return
+
+    logger.info(
+        f"Extracting phashes for {len(pending)} videos "
+        f"({len(stored)} loaded from disk cache)"
+    )
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+        extracted = dict(zip(pending, executor.map(extract_phash, pending)))
+
+    cache.update(extracted)
+    store_phashes(extracted)
@@ -26,16 +26,36 @@ Output:
 """
 
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
+from itertools import chain
+from operator import itemgetter
+from typing import Iterable, Optional
 
 import imagehash
 
 from models.schemas import Video, PayoutUnit, ExceptionVideo
-from services.frame_extractor import get_phash, compare_hashes, is_same_video
+from services.frame_extractor import (
+    PHASH_THRESHOLD,
+    get_phash,
+    compare_hashes,
+    hamming_distance,
+    is_same_video,
+    phash_to_int,
+    prefetch_phashes,
+)
 
 logger = logging.getLogger(__name__)
 
+# Creators matched concurrently. Each worker spends its time waiting on
+# yt-dlp/ffmpeg subprocesses, so threads (not processes) are enough.
+MAX_MATCH_WORKERS = 8
+
+# Sort key for videos with no created_at — orders them after every real
+# timestamp. UTC-aware so it compares cleanly with Shortimize datetimes.
+CREATED_AT_MISSING = datetime(9999, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
+
 
 # ===========================================================================
 # Public API
@@ -126,16 +146,17 @@ def _map_videos_to_creators(
     mapped: list[Video] = []
     exceptions: list[ExceptionVideo] = []
 
-    for video in videos:
-        # Normalize username for lookup (lowercase, stripped)
-        normalized_username = video.username.strip().lower()
+    # Platform → handle map, so each video costs two hash lookups instead of
+    # a chain of platform string comparisons
+    platform_maps = {"tiktok": tiktok_map, "instagram": instagram_map}
+    no_map: dict[str, str] = {}
 
-        # Look up in the appropriate platform map
-        creator_name = None
-        if video.platform == "tiktok":
-            creator_name = tiktok_map.get(normalized_username)
-        elif video.platform == "instagram":
-            creator_name = instagram_map.get(normalized_username)
+    for video in videos:
+        # Look up the normalized (lowercase, stripped) username in the
+        # appropriate platform map
+        creator_name = platform_maps.get(video.platform, no_map).get(
+            video.normalized_username
+        )
 
         if creator_name:
             # Create a copy with creator_name set
@@ -144,16 +165,9 @@ def _map_videos_to_creators(
             )
             mapped.append(video_with_creator)
         else:
-            exceptions.append(ExceptionVideo(
-                username=video.username,
-                platform=video.platform,
-                ad_link=video.ad_link,
-                uploaded_at=video.uploaded_at,
-                created_at=video.created_at,
-                latest_views=video.latest_views,
-                video_length=video.video_length,
-                reason="Not in creator status list",
-            ))
+            exceptions.append(
+                ExceptionVideo.from_video(video, "Not in creator status list")
+            )
 
     return mapped, exceptions
 
@@ -174,51 +188,42 @@ def _deduplicate_videos(videos: list[Video]) -> list[Video]:
     Videos with no ad_link AND no ad_id are always kept (cannot be deduped).
     """
     # --- Phase 1: Dedup by ad_link ---
+    # Both phases are kept: phase 2 also collapses rows whose ad_links differ
+    # but share an ad_id, which a single link-or-id key would miss
     by_ad_link: dict[str, Video] = {}
+    no_link_videos: list[Video] = []
 
     for video in videos:
         key = video.ad_link.strip()
         if not key:
+            no_link_videos.append(video)
             continue
 
-        if key in by_ad_link:
-            existing = by_ad_link[key]
-            if _is_more_recent(video, existing):
-                logger.debug(
-                    f"Dedup (ad_link): replacing {existing.username} with "
-                    f"{video.username} for {key}"
-                )
-                by_ad_link[key] = video
-        else:
+        # setdefault inserts first sightings with a single hash lookup
+        existing = by_ad_link.setdefault(key, video)
+        if existing is not video and _is_more_recent(video, existing):
+            logger.debug(
+                f"Dedup (ad_link): replacing {existing.username} with "
+                f"{video.username} for {key}"
+            )
             by_ad_link[key] = video
 
-    deduped_by_link = list(by_ad_link.values())
-    no_link_videos = [v for v in videos if not v.ad_link.strip()]
-    intermediate = deduped_by_link + no_link_videos
-
     # --- Phase 2: Dedup by ad_id ---
     by_ad_id: dict[str, Video] = {}
     no_id_videos: list[Video] = []
 
-    for video in intermediate:
-        if not video.ad_id:
-            no_id_videos.append(video)
-            continue
-
-        key = video.ad_id.strip()
+    for video in chain(by_ad_link.values(), no_link_videos):
+        key = (video.ad_id or "").strip()
         if not key:
             no_id_videos.append(video)
             continue
 
-        if key in by_ad_id:
-            existing = by_ad_id[key]
-            if _is_more_recent(video, existing):
-                logger.debug(
-                    f"Dedup (ad_id): replacing {existing.username} with "
-                    f"{video.username} for ad_id={key}"
-                )
-                by_ad_id[key] = video
-        else:
+        existing = by_ad_id.setdefault(key, video)
+        if existing is not video and _is_more_recent(video, existing):
+            logger.debug(
+                f"Dedup (ad_id): replacing {existing.username} with "
+                f"{video.username} for ad_id={key}"
+            )
             by_ad_id[key] = video
 
     result = list(by_ad_id.values()) + no_id_videos
@@ -249,49 +254,86 @@ def _match_all_creators(
     Steps 7–11: Group by creator, match within each creator, build payout units.
 
     Step 7:  Group videos by creator_name
-    Steps 8-11: For each creator, run the matching algorithm
+    Steps 8-11: For each creator, run the matching algorithm (creators are
+                independent, so up to MAX_MATCH_WORKERS run concurrently)
 
     Returns:
         all_payout_units: Combined payout units from all creators (paired only)
         all_exceptions:   Combined exceptions from all creators
     """
     # ------------------------------------------------------------------
-    # Step 7: Group by creator_name
+    # Step 7: Group by creator_name, split by platform in the same pass
     # ------------------------------------------------------------------
-    creator_groups: dict[str, list[Video]] = {}
+    creator_groups: defaultdict[str, tuple[list[Video], list[Video]]] = (
+        defaultdict(lambda: ([], []))
+    )
     for video in videos:
-        name = video.creator_name or "UNKNOWN"
-        if name not in creator_groups:
-            creator_groups[name] = []
-        creator_groups[name].append(video)
+        tiktok_videos, instagram_videos = creator_groups[video.creator_name or "UNKNOWN"]
+        if video.platform == "tiktok":
+            tiktok_videos.append(video)
+        elif video.platform == "instagram":
+            instagram_videos.append(video)
 
     logger.info(f"Step 7: grouped into {len(creator_groups)} creators")
 
     # ------------------------------------------------------------------
     # Shared phash cache — each video extracted only once across all creators
     # Only stores 64-bit hashes (~100 bytes each), not full images (~2.7MB each)
+    # Safe to share across worker threads: single dict get/set operations are
+    # atomic, and ad_links are unique after dedup so creators don't race
     # ------------------------------------------------------------------
     phash_cache: dict[str, Optional[imagehash.ImageHash]] = {}
 
+    # Creators in name order; the same platform lists feed the prefetch and
+    # the per-creator matching below
+    platform_groups: list[tuple[str, list[Video], list[Video]]] = [
+        (creator_name, tiktok_videos, instagram_videos)
+        for creator_name, (tiktok_videos, instagram_videos) in sorted(
+            creator_groups.items(), key=itemgetter(0)
+        )
+    ]
+
+    # Every video with a length counterpart (±1s) on the creator's other
+    # platform can reach get_phash() in Step 9 or Step 10, so extract them
+    # all up front across a thread pool; matching then only hits the cache.
+    # Videos with no counterpart can never match and are never hashed
+    prefetch_phashes(
+        (
+            video.ad_link
+            for _, tiktok_videos, instagram_videos in platform_groups
+            for video in _phash_candidates(tiktok_videos, instagram_videos)
+        ),
+        phash_cache,
+    )
+
     # ------------------------------------------------------------------
-    # Process each creator
+    # Process each creator — creators never share videos, so they are
+    # matched in parallel; map() keeps results in sorted creator order
     # ------------------------------------------------------------------
-    all_payout_units: list[PayoutUnit] = []
-    all_exceptions: list[ExceptionVideo] = []
-
-    for creator_name, creator_videos in sorted(creator_groups.items()):
-        tiktok_videos = [v for v in creator_videos if v.platform == "tiktok"]
-        instagram_videos = [v for v in creator_videos if v.platform == "instagram"]
+    def match_creator(group: tuple[str, list[Video], list[Video]]):
+        creator_name, tiktok_videos, instagram_videos = group
 
         logger.debug(
             f"Creator '{creator_name}': "
             f"{len(tiktok_videos)} TikTok, {len(instagram_videos)} Instagram"
         )
 
-        payout_units, exceptions = _match_creator_videos(
+        return _match_creator_videos(
             creator_name, tiktok_videos, instagram_videos, phash_cache
         )
 
+    workers = min(MAX_MATCH_WORKERS, len(platform_groups))
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(match_creator, platform_groups))
+    else:
+        results = [match_creator(group) for group in platform_groups]
+
+    all_payout_units: list[PayoutUnit] = []
+    all_exceptions: list[ExceptionVideo] = []
+
+    for payout_units, exceptions in results:
         all_payout_units.extend(payout_units)
         all_exceptions.extend(exceptions)
 
@@ -326,15 +368,35 @@ def _match_creator_videos(
     tiktok_sorted = sorted(tiktok_videos, key=_sort_key_created_at)
     instagram_sorted = sorted(instagram_videos, key=_sort_key_created_at)
 
+    # ------------------------------------------------------------------
+    # Early exit: no TT/IG length pair within ±1s means neither Step 9 nor
+    # Step 10 can confirm a match, so skip their frame extraction entirely
+    # ------------------------------------------------------------------
+    if not _lengths_overlap(tiktok_sorted, instagram_sorted):
+        logger.debug(
+            f"  Creator '{creator_name}': no TT/IG length overlap, "
+            f"skipping phash matching"
+        )
+        exceptions = [
+            ExceptionVideo.from_video(video, "Only posted on one platform")
+            for video in tiktok_sorted + instagram_sorted
+        ]
+        return [], exceptions
+
     # ------------------------------------------------------------------
     # Track which videos have been "used" (matched)
     # ------------------------------------------------------------------
-    tt_used: set[int] = set()
-    ig_used: set[int] = set()
+    # One flag byte per sorted index — membership is a plain byte load
+    tt_used = bytearray(len(tiktok_sorted))
+    ig_used = bytearray(len(instagram_sorted))
 
     payout_units: list[PayoutUnit] = []
     exceptions: list[ExceptionVideo] = []
 
+    # Per-pair debug lines are skipped entirely (no f-string formatting)
+    # unless DEBUG logging is on
+    debug = logger.isEnabledFor(logging.DEBUG)
+
     # ------------------------------------------------------------------
     # Step 9: PRIMARY matching — sequence position + length + phash
     # ------------------------------------------------------------------
@@ -347,10 +409,11 @@ def _match_creator_videos(
         # Check 1: Video length match (±1 second tolerance)
         length_diff = _video_length_diff(tt_video, ig_video)
         if length_diff is None or length_diff > 1:
-            logger.debug(
-                f"  Pair #{i+1}: length mismatch → unmatched pool "
-                f"(TT={tt_video.video_length}s, IG={ig_video.video_length}s)"
-            )
+            if debug:
+                logger.debug(
+                    f"  Pair #{i+1}: length mismatch → unmatched pool "
+                    f"(TT={tt_video.video_length}s, IG={ig_video.video_length}s)"
+                )
             continue  # Both stay unmatched for Step 10
 
         # Check 2: First frame phash comparison
@@ -358,15 +421,17 @@ def _match_creator_videos(
         ig_hash = get_phash(ig_video.ad_link, phash_cache)
 
         if tt_hash is None:
-            logger.debug(f"  Pair #{i+1}: TT frame extraction failed")
+            if debug:
+                logger.debug(f"  Pair #{i+1}: TT frame extraction failed")
             exceptions.append(_build_extraction_failed_exception(tt_video))
-            tt_used.add(i)  # Mark as used so Step 10 skips it
+            tt_used[i] = 1  # Mark as used so Step 10 skips it
             continue
 
         if ig_hash is None:
-            logger.debug(f"  Pair #{i+1}: IG frame extraction failed")
+            if debug:
+                logger.debug(f"  Pair #{i+1}: IG frame extraction failed")
             exceptions.append(_build_extraction_failed_exception(ig_video))
-            ig_used.add(i)
+            ig_used[i] = 1
             continue
 
         phash_dist = compare_hashes(tt_hash, ig_hash)
@@ -379,13 +444,14 @@ def _match_creator_videos(
                 note=f"sequence match, phash distance: {phash_dist}",
                 phash_distance=phash_dist,
             ))
-            tt_used.add(i)
-            ig_used.add(i)
-            logger.debug(
-                f"  Pair #{i+1}: matched (length={tt_video.video_length}s, "
-                f"phash={phash_dist})"
-            )
-        else:
+            tt_used[i] = 1
+            ig_used[i] = 1
+            if debug:
+                logger.debug(
+                    f"  Pair #{i+1}: matched (length={tt_video.video_length}s, "
+                    f"phash={phash_dist})"
+                )
+        elif debug:
             logger.debug(
                 f"  Pair #{i+1}: phash mismatch ({phash_dist}) → unmatched pool"
             )
@@ -398,35 +464,47 @@ def _match_creator_videos(
     unmatched_tt = [
         (i, tiktok_sorted[i])
         for i in range(len(tiktok_sorted))
-        if i not in tt_used
+        if not tt_used[i]
     ]
     unmatched_ig = [
         (i, instagram_sorted[i])
         for i in range(len(instagram_sorted))
-        if i not in ig_used
+        if not ig_used[i]
     ]
 
-    # Check for extraction failures in unmatched pool first
+    # Only videos with a length counterpart (±1s) in the other platform's
+    # unmatched pool can match; the rest skip frame extraction entirely and
+    # fall through to Step 11 as unpaired
+    tt_lengths = _length_set(video for _, video in unmatched_tt)
+    ig_lengths = _length_set(video for _, video in unmatched_ig)
+
+    # Check for extraction failures in unmatched pool first. Valid hashes
+    # are packed into 64-bit ints once, so every candidate comparison below
+    # is a single xor + popcount instead of an ImageHash array diff
     valid_tt = []
     for idx, video in unmatched_tt:
+        if not _has_length_counterpart(video, ig_lengths):
+            continue
         h = get_phash(video.ad_link, phash_cache)
         if h is None:
             exceptions.append(_build_extraction_failed_exception(video))
-            tt_used.add(idx)
+            tt_used[idx] = 1
         else:
-            valid_tt.append((idx, video, h))
+            valid_tt.append((idx, video, phash_to_int(h)))
 
     valid_ig = []
     for idx, video in unmatched_ig:
+        if not _has_length_counterpart(video, tt_lengths):
+            continue
         h = get_phash(video.ad_link, phash_cache)
         if h is None:
             exceptions.append(_build_extraction_failed_exception(video))
-            ig_used.add(idx)
+            ig_used[idx] = 1
         else:
-            valid_ig.append((idx, video, h))
+            valid_ig.append((idx, video, phash_to_int(h)))
 
     # Build length index for Instagram candidates (for fast lookup)
-    ig_by_length: dict[int, list[tuple[int, Video, imagehash.ImageHash]]] = {}
+    ig_by_length: dict[int, list[tuple[int, Video, int]]] = {}
     for idx, video, h in valid_ig:
         if video.video_length is not None:
             length = video.video_length
@@ -436,7 +514,7 @@ def _match_creator_videos(
 
     # For each unmatched TikTok, find best phash match among same-length IG
     for tt_idx, tt_video, tt_hash in valid_tt:
-        if tt_idx in tt_used:
+        if tt_used[tt_idx]:
             continue  # Already matched by a prior fallback iteration
         if tt_video.video_length is None:
             continue
@@ -449,11 +527,11 @@ def _match_creator_videos(
         best_phash = None
 
         for ig_idx, ig_video, ig_hash in candidates:
-            if ig_idx in ig_used:
+            if ig_used[ig_idx]:
                 continue
 
-            phash_dist = compare_hashes(tt_hash, ig_hash)
-            if phash_dist <= 10:
+            phash_dist = hamming_distance(tt_hash, ig_hash)
+            if phash_dist <= PHASH_THRESHOLD:
                 if best_phash is None or phash_dist < best_phash:
                     best_ig_idx = ig_idx
                     best_phash = phash_dist
@@ -466,41 +544,28 @@ def _match_creator_videos(
                 note=f"fallback match: same length, phash distance: {best_phash}",
                 phash_distance=best_phash,
             ))
-            tt_used.add(tt_idx)
-            ig_used.add(best_ig_idx)
-            logger.debug(
-                f"  Fallback: TT idx={tt_idx} ↔ IG idx={best_ig_idx} "
-                f"(length={tt_video.video_length}s, phash={best_phash})"
-            )
+            tt_used[tt_idx] = 1
+            ig_used[best_ig_idx] = 1
+            if debug:
+                logger.debug(
+                    f"  Fallback: TT idx={tt_idx} ↔ IG idx={best_ig_idx} "
+                    f"(length={tt_video.video_length}s, phash={best_phash})"
+                )
 
     # ------------------------------------------------------------------
     # Step 11: Handle unmatched videos → Exceptions only (no payout)
     # ------------------------------------------------------------------
     for i, tt_video in enumerate(tiktok_sorted):
-        if i not in tt_used:
-            exceptions.append(ExceptionVideo(
-                username=tt_video.username,
-                platform=tt_video.platform,
-                ad_link=tt_video.ad_link,
-                uploaded_at=tt_video.uploaded_at,
-                created_at=tt_video.created_at,
-                latest_views=tt_video.latest_views,
-                video_length=tt_video.video_length,
-                reason="Only posted on one platform",
-            ))
+        if not tt_used[i]:
+            exceptions.append(
+                ExceptionVideo.from_video(tt_video, "Only posted on one platform")
+            )
 
     for i, ig_video in enumerate(instagram_sorted):
-        if i not in ig_used:
-            exceptions.append(ExceptionVideo(
-                username=ig_video.username,
-                platform=ig_video.platform,
-                ad_link=ig_video.ad_link,
-                uploaded_at=ig_video.uploaded_at,
-                created_at=ig_video.created_at,
-                latest_views=ig_video.latest_views,
-                video_length=ig_video.video_length,
-                reason="Only posted on one platform",
-            ))
+        if not ig_used[i]:
+            exceptions.append(
+                ExceptionVideo.from_video(ig_video, "Only posted on one platform")
+            )
 
     # Log summary for this creator
     paired_count = len(payout_units)
@@ -518,16 +583,7 @@ def _match_creator_videos(
 
 def _build_extraction_failed_exception(video: Video) -> ExceptionVideo:
     """Build an ExceptionVideo for a video whose first frame couldn't be extracted."""
-    return ExceptionVideo(
-        username=video.username,
-        platform=video.platform,
-        ad_link=video.ad_link,
-        uploaded_at=video.uploaded_at,
-        created_at=video.created_at,
-        latest_views=video.latest_views,
-        video_length=video.video_length,
-        reason="Video unavailable",
-    )
+    return ExceptionVideo.from_video(video, "Video unavailable")
 
 
 # ===========================================================================
@@ -557,7 +613,9 @@ def _build_paired_unit(
     else:
         best_platform = "instagram"
 
-    return PayoutUnit(
+    # Both videos are validated Video objects and every other field is
+    # computed here, so skip pydantic re-validation
+    return PayoutUnit.model_construct(
         creator_name=creator_name,
         tiktok_video=tt_video,
         instagram_video=ig_video,
@@ -581,9 +639,8 @@ def _sort_key_created_at(video: Video) -> datetime:
     Uses UTC-aware datetime to avoid TypeError when comparing with
     timezone-aware created_at values from the Shortimize API.
     """
-    if video.created_at is None:
-        return datetime(9999, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
-    return video.created_at
+    created_at = video.created_at
+    return CREATED_AT_MISSING if created_at is None else created_at
 
 
 def _video_length_diff(v1: Video, v2: Video) -> Optional[int]:
@@ -594,3 +651,48 @@ def _video_length_diff(v1: Video, v2: Video) -> Optional[int]:
     if v1.video_length is None or v2.video_length is None:
         return None
     return abs(v1.video_length - v2.video_length)
+
+
+def _length_set(videos: Iterable[Video]) -> set[int]:
+    """Distinct video_length values, ignoring videos with no length."""
+    return {v.video_length for v in videos if v.video_length is not None}
+
+
+def _has_length_counterpart(video: Video, other_lengths: set[int]) -> bool:
+    """
+    Check whether video is within the ±1 second length tolerance of any length
+    in other_lengths. Videos without a video_length can never match.
+    """
+    length = video.video_length
+    return length is not None and (
+        length in other_lengths
+        or length - 1 in other_lengths
+        or length + 1 in other_lengths
+    )
+
+
+def _lengths_overlap(tiktok_videos: list[Video], instagram_videos: list[Video]) -> bool:
+    """
+    Check whether any TikTok/Instagram pair is within the ±1 second length
+    tolerance. False means no pair can pass the length check in Step 9 or 10.
+    """
+    ig_lengths = _length_set(instagram_videos)
+    return bool(ig_lengths) and any(
+        _has_length_counterpart(tt, ig_lengths) for tt in tiktok_videos
+    )
+
+
+def _phash_candidates(
+    tiktok_videos: list[Video],
+    instagram_videos: list[Video],
+) -> list[Video]:
+    """
+    Videos of one creator that can ever reach get_phash() in Step 9 or 10:
+    those with a length counterpart (±1s) on the other platform.
+    """
+    tt_lengths = _length_set(tiktok_videos)
+    ig_lengths = _length_set(instagram_videos)
+    return [
+        *(v for v in tiktok_videos if _has_length_counterpart(v, ig_lengths)),
+        *(v for v in instagram_videos if _has_length_counterpart(v, tt_lengths)),
+    ]
@@ -36,7 +36,11 @@ Count definitions (CreatorSummary):
 """
 
 import logging
-import math
+from bisect import bisect_right
+from collections import defaultdict
+
+import numpy as np
+
 from models.schemas import PayoutUnit, CreatorSummary
 
 logger = logging.getLogger(__name__)
@@ -73,6 +77,21 @@ HIGH_TIER_BASE = 1_500.0        # Base payout at 6M+
 HIGH_TIER_INCREMENT = 150.0     # Additional $ per million above 5M
 HIGH_TIER_MILLION_OFFSET = 5    # Subtract this from floor_millions in the formula
 
+# ---------------------------------------------------------------------------
+# Array form of the fixed tiers — the lookup table both payout paths use
+# (FIXED_TIERS stays as the readable definition they are built from):
+# searchsorted(TIER_MIN_VIEWS, views, side="right") gives the index into
+# TIER_PAYOUTS, where index 0 is "below 1,000 views → $0".
+# Relies on FIXED_TIERS being contiguous and sorted, which it is.
+# ---------------------------------------------------------------------------
+TIER_MIN_VIEWS = np.array([t[0] for t in FIXED_TIERS], dtype=np.int64)
+TIER_PAYOUTS = np.array([0.0] + [t[2] for t in FIXED_TIERS], dtype=np.float64)
+
+# Same table as plain lists for the scalar path (calculate_payout), where
+# bisect on a list beats both a linear scan and a numpy call per value
+_TIER_MIN_VIEWS = TIER_MIN_VIEWS.tolist()
+_TIER_PAYOUTS = TIER_PAYOUTS.tolist()
+
 
 # ===========================================================================
 # Step B: Calculate effective views (apply 10M cap)
@@ -95,7 +114,8 @@ def calculate_effective_views(chosen_views: int) -> int:
         effective_views: Capped at 10M
     """
     if chosen_views > VIEW_CAP:
-        logger.debug(f"Views capped: {chosen_views:,} → {VIEW_CAP:,}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Views capped: {chosen_views:,} → {VIEW_CAP:,}")
         return VIEW_CAP
     return chosen_views
 
@@ -127,25 +147,19 @@ def calculate_payout(effective_views: int) -> float:
     if effective_views < QUALIFICATION_THRESHOLD:
         return 0.0
 
-    # ------------------------------------------------------------------
-    # Step C: Fixed tier lookup (1K – 5,999,999)
-    # ------------------------------------------------------------------
-    for min_views, max_views, payout in FIXED_TIERS:
-        if min_views <= effective_views <= max_views:
-            return payout
-
     # ------------------------------------------------------------------
     # Step C: Formula tier (6,000,000 – 10,000,000)
     # payout = $1,500 + $150 × (floor_millions - 5)
     # ------------------------------------------------------------------
     if effective_views >= HIGH_TIER_FLOOR:
-        floor_millions = math.floor(effective_views / 1_000_000)
-        payout = HIGH_TIER_BASE + HIGH_TIER_INCREMENT * (floor_millions - HIGH_TIER_MILLION_OFFSET)
-        return payout
+        floor_millions = effective_views // 1_000_000
+        return HIGH_TIER_BASE + HIGH_TIER_INCREMENT * (floor_millions - HIGH_TIER_MILLION_OFFSET)
 
-    # Should never reach here if tiers are defined correctly
-    logger.warning(f"No tier matched for effective_views={effective_views:,}")
-    return 0.0
+    # ------------------------------------------------------------------
+    # Step C: Fixed tier lookup (1K – 5,999,999) — binary search on the
+    # tier lower bounds, same indexing as the vectorized path
+    # ------------------------------------------------------------------
+    return _TIER_PAYOUTS[bisect_right(_TIER_MIN_VIEWS, effective_views)]
 
 
 # ===========================================================================
@@ -161,6 +175,10 @@ def process_payouts(payout_units: list[PayoutUnit]) -> list[PayoutUnit]:
       2. payout_amount = tier lookup on effective_views
       3. Update the PayoutUnit with both values
 
+    Steps 1-2 run over all units at once as numpy arrays (same results as
+    calculate_effective_views / calculate_payout, which stay the per-value
+    reference implementation).
+
     Note: PayoutUnit.chosen_views is NOT modified (preserved for audit).
 
     Args:
@@ -169,35 +187,47 @@ def process_payouts(payout_units: list[PayoutUnit]) -> list[PayoutUnit]:
     Returns:
         The same list with effective_views and payout_amount populated
     """
-    total_payout = 0.0
-    qualified_count = 0
-    capped_count = 0
-
-    for unit in payout_units:
-        # ------------------------------------------------------------------
-        # Step B: Apply 10M cap
-        # ------------------------------------------------------------------
-        unit.effective_views = calculate_effective_views(unit.chosen_views)
+    if not payout_units:
+        logger.info("Payout processing complete: 0 units")
+        return payout_units
+
+    chosen = np.fromiter(
+        (unit.chosen_views for unit in payout_units),
+        dtype=np.int64,
+        count=len(payout_units),
+    )
 
-        if unit.chosen_views > VIEW_CAP:
-            capped_count += 1
+    # ------------------------------------------------------------------
+    # Step B: Apply 10M cap
+    # ------------------------------------------------------------------
+    effective = np.minimum(chosen, VIEW_CAP)
 
-        # ------------------------------------------------------------------
-        # Steps A + C: Calculate payout
-        # ------------------------------------------------------------------
-        unit.payout_amount = calculate_payout(unit.effective_views)
+    # ------------------------------------------------------------------
+    # Steps A + C: fixed tier lookup (index 0 = not qualified → $0),
+    # then the 6M–10M formula tier on top
+    # ------------------------------------------------------------------
+    payouts = TIER_PAYOUTS[np.searchsorted(TIER_MIN_VIEWS, effective, side="right")]
+    high_tier = effective >= HIGH_TIER_FLOOR
+    payouts[high_tier] = HIGH_TIER_BASE + HIGH_TIER_INCREMENT * (
+        effective[high_tier] // 1_000_000 - HIGH_TIER_MILLION_OFFSET
+    )
 
-        if unit.chosen_views >= QUALIFICATION_THRESHOLD:
-            qualified_count += 1
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for unit, eff, payout in zip(payout_units, effective.tolist(), payouts.tolist()):
+        unit.effective_views = eff
+        unit.payout_amount = payout
 
-        total_payout += unit.payout_amount
+        if debug:
+            logger.debug(
+                f"  [{unit.creator_name}] "
+                f"chosen={unit.chosen_views:,} → effective={eff:,} → "
+                f"${payout:,.2f} "
+                f"(method={unit.match_method})"
+            )
 
-        logger.debug(
-            f"  [{unit.creator_name}] "
-            f"chosen={unit.chosen_views:,} → effective={unit.effective_views:,} → "
-            f"${unit.payout_amount:,.2f} "
-            f"(method={unit.match_method})"
-        )
+    total_payout = float(payouts.sum())
+    qualified_count = int(np.count_nonzero(chosen >= QUALIFICATION_THRESHOLD))
+    capped_count = int(np.count_nonzero(chosen > VIEW_CAP))
 
     logger.info(
         f"Payout processing complete: "
@@ -242,53 +272,49 @@ def build_creator_summaries(
         exception_counts = {}
 
     # ------------------------------------------------------------------
-    # Group PayoutUnits by creator_name
+    # Accumulate per-creator totals in one pass over the payout units:
+    #   creator_name -> [qualified_count, total_payout, paired_count]
+    # Payouts are added in unit order, exactly as a per-group sum() would.
     # ------------------------------------------------------------------
-    creator_units: dict[str, list[PayoutUnit]] = {}
+    totals: defaultdict[str, list] = defaultdict(lambda: [0, 0.0, 0])
     for unit in payout_units:
-        name = unit.creator_name
-        if name not in creator_units:
-            creator_units[name] = []
-        creator_units[name].append(unit)
+        acc = totals[unit.creator_name]
+
+        # Count qualified payout units (chosen_views >= 1,000)
+        if unit.chosen_views >= QUALIFICATION_THRESHOLD:
+            acc[0] += 1
+        acc[1] += unit.payout_amount
+        # All payout units are paired (unpaired go to Exceptions, not PayoutUnits)
+        acc[2] += 1
 
     # ------------------------------------------------------------------
     # Build a CreatorSummary for each creator
     # ------------------------------------------------------------------
     summaries: list[CreatorSummary] = []
+    debug = logger.isEnabledFor(logging.DEBUG)
 
-    for creator_name in sorted(creator_units.keys()):
-        units = creator_units[creator_name]
-
-        # Count qualified payout units (chosen_views >= 1,000)
-        qualified_count = sum(
-            1 for u in units if u.chosen_views >= QUALIFICATION_THRESHOLD
-        )
-
-        # Sum all payout amounts
-        total_payout = sum(u.payout_amount for u in units)
-
-        # All payout units are paired (unpaired go to Exceptions, not PayoutUnits)
-        paired_count = len(units)
+    for creator_name in sorted(totals):
+        qualified_count, total_payout, paired_count = totals[creator_name]
 
         # Exception count from the exceptions dict
         exc_count = exception_counts.get(creator_name, 0)
 
-        summary = CreatorSummary(
+        summaries.append(CreatorSummary(
             creator_name=creator_name,
             qualified_video_count=qualified_count,
             total_payout=total_payout,
             paired_video_count=paired_count,
             exception_count=exc_count,
-        )
-        summaries.append(summary)
-
-        logger.debug(
-            f"  Creator '{creator_name}': "
-            f"qualified={qualified_count}, "
-            f"total=${total_payout:,.2f}, "
-            f"paired={paired_count}, "
-            f"exceptions={exc_count}"
-        )
+        ))
+
+        if debug:
+            logger.debug(
+                f"  Creator '{creator_name}': "
+                f"qualified={qualified_count}, "
+                f"total=${total_payout:,.2f}, "
+                f"paired={paired_count}, "
+                f"exceptions={exc_count}"
+            )
 
     logger.info(
         f"Built {len(summaries)} creator summaries, "
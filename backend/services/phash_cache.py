@@ -0,0 +1,158 @@
+"""
+Persistent on-disk phash cache, keyed by ad_link.
+
+Frame extraction costs ~1.8s per video, and the in-memory cache in
+frame_extractor only lives for one pipeline run. The phash of a published
+video never changes, so successful hashes are stored in a small SQLite
+database and reused across runs until they are older than PHASH_CACHE_TTL.
+
+Failed extractions (None) are persisted too, but only for
+FAILED_PHASH_CACHE_TTL: a removed video is not re-downloaded on every rerun,
+while a transient failure (CDN 403, rate limit) is retried the next day.
+The table name carries a version that is bumped whenever frame extraction
+changes in a way that shifts hash values, so old and new hashes never mix.
+
+Functions:
+  load_phashes(ad_links) -> dict[str, ImageHash | None]
+      Fresh cached hashes for the given links (misses are omitted,
+      recent failed extractions map to None).
+
+  store_phashes(phashes) -> None
+      Insert or refresh hashes (or failures) for the given links.
+
+Any SQLite error is logged and treated as a cache miss; the disk cache must
+never break a payout run.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Iterable, Optional
+
+import imagehash
+
+from config import PHASH_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Cache settings
+# ---------------------------------------------------------------------------
+DB_PATH = PHASH_CACHE_PATH
+PHASH_CACHE_TTL = 30 * 24 * 60 * 60  # seconds (30 days)
+FAILED_PHASH_CACHE_TTL = 24 * 60 * 60  # seconds (1 day) for failed extractions
+DB_TIMEOUT = 10.0                    # seconds to wait on a locked database
+
+# SQLite caps bound parameters per statement; look links up in batches
+LOOKUP_BATCH_SIZE = 500
+
+# v2: frames downscaled to 32x32 grayscale by ffmpeg (was full-size JPEG)
+TABLE = "phash_cache_v2"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    ad_link   TEXT PRIMARY KEY,
+    phash_hex TEXT NOT NULL,
+    cached_at REAL NOT NULL
+)
+"""
+
+# phash_hex stored for a failed extraction (loaded back as None)
+FAILED_MARKER = ""
+
+
+# ===========================================================================
+# Public API
+# ===========================================================================
+
+def load_phashes(
+    ad_links: Iterable[str],
+) -> dict[str, Optional[imagehash.ImageHash]]:
+    """
+    Look up cached phashes that are still within the TTL.
+
+    Args:
+        ad_links: Video URLs to look up
+
+    Returns:
+        dict[ad_link -> ImageHash | None] for every fresh hit, where None is a
+        failed extraction younger than FAILED_PHASH_CACHE_TTL. Misses are
+        omitted.
+    """
+    links = list(ad_links)
+    if not links:
+        return {}
+
+    now = time.time()
+    cutoff = now - PHASH_CACHE_TTL
+    failed_cutoff = now - FAILED_PHASH_CACHE_TTL
+    found: dict[str, Optional[imagehash.ImageHash]] = {}
+
+    try:
+        with closing(_connect()) as conn:
+            for start in range(0, len(links), LOOKUP_BATCH_SIZE):
+                batch = links[start:start + LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT ad_link, phash_hex FROM {TABLE} "
+                    f"WHERE cached_at >= CASE WHEN phash_hex = ? THEN ? ELSE ? END "
+                    f"AND ad_link IN ({placeholders})",
+                    (FAILED_MARKER, failed_cutoff, cutoff, *batch),
+                )
+                for ad_link, phash_hex in rows:
+                    found[ad_link] = (
+                        None if phash_hex == FAILED_MARKER
+                        else imagehash.hex_to_hash(phash_hex)
+                    )
+    except (sqlite3.Error, OSError, ValueError) as e:
+        logger.warning(f"Phash cache lookup failed, treating as miss: {e}")
+        return {}
+
+    logger.debug(f"Phash cache: {len(found)}/{len(links)} hits")
+    return found
+
+
+def store_phashes(phashes: dict[str, Optional[imagehash.ImageHash]]) -> None:
+    """
+    Insert or refresh cached phashes.
+
+    Args:
+        phashes: dict[ad_link -> ImageHash | None]; None records a failed
+                 extraction, kept for FAILED_PHASH_CACHE_TTL only
+    """
+    if not phashes:
+        return
+
+    now = time.time()
+    rows = [
+        (ad_link, FAILED_MARKER if phash is None else str(phash), now)
+        for ad_link, phash in phashes.items()
+    ]
+
+    try:
+        with closing(_connect()) as conn:
+            with conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {TABLE} "
+                    "(ad_link, phash_hex, cached_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Phash cache write failed: {e}")
+
+
+# ===========================================================================
+# Internal helpers
+# ===========================================================================
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database, creating its directory and table if needed."""
+    directory = os.path.dirname(DB_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT)
+    conn.execute(_SCHEMA)
+    return conn
@@ -23,6 +23,7 @@ def mock_frame_extraction():
       - get_phash() returns a synthetic ImageHash (never None)
       - is_same_video() returns True (all phash checks pass)
       - compare_hashes() returns 0 (distance = 0)
+      - prefetch_phashes() does nothing (get_phash is mocked per call)
 
     Tests that need specific phash behavior can override by configuring
     the mock's return_value or side_effect within the test body.
@@ -31,9 +32,19 @@ def mock_frame_extraction():
 
     with patch("services.matcher.get_phash", return_value=fake_hash) as mock_get, \
          patch("services.matcher.is_same_video", return_value=True) as mock_is_same, \
-         patch("services.matcher.compare_hashes", return_value=0) as mock_compare:
+         patch("services.matcher.compare_hashes", return_value=0) as mock_compare, \
+         patch("services.matcher.prefetch_phashes") as mock_prefetch:
         yield {
             "get_phash": mock_get,
             "is_same_video": mock_is_same,
             "compare_hashes": mock_compare,
+            "prefetch_phashes": mock_prefetch,
         }
+
+
+@pytest.fixture(autouse=True)
+def isolated_phash_cache(tmp_path, monkeypatch):
+    """Point the persistent phash cache at a per-test temp database."""
+    monkeypatch.setattr(
+        "services.phash_cache.DB_PATH", str(tmp_path / "phash_cache.sqlite")
+    )
@@ -2,7 +2,8 @@
 Comprehensive tests for services/excel_export.py.
 
 Tests verify:
-  1. FILE GENERATION: file created, correct name, correct path
+  1. FILE GENERATION: file created, correct name, correct path,
+     saved atomically (no partial or temp files left behind)
   2. TAB STRUCTURE: 3 tabs with correct names
   3. TAB 1 — Creator Payout Summary:
      - Correct headers (5 columns), row count, sort order (payout desc), data accuracy
@@ -23,12 +24,15 @@ import os
 import pytest
 import tempfile
 import shutil
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from openpyxl import load_workbook
 from openpyxl.styles import Font
+from openpyxl.writer.excel import ExcelWriter
 
 from models.schemas import Video, PayoutUnit, CreatorSummary, ExceptionVideo
 from services.excel_export import (
@@ -37,9 +41,10 @@ from services.excel_export import (
     _get_video_length,
     _get_latest_updated_at,
     _tab2_sort_key,
-    _format_date,
-    _format_datetime,
+    _excel_datetime,
     CURRENCY_FORMAT,
+    DATE_FORMAT,
+    DATETIME_FORMAT,
     NUMBER_FORMAT,
 )
 
@@ -168,6 +173,48 @@ class TestFileGeneration:
         # filepath should be under the output_dir
         assert filepath.startswith(output_dir)
 
+    def test_concurrent_same_period_reports_are_whole(self, output_dir):
+        """Parallel runs for one period each replace the file atomically."""
+        def run(_):
+            return generate_report(
+                [make_summary()], [make_paired_unit()], [make_exception()],
+                date(2026, 2, 20), date(2026, 2, 21), output_dir,
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            paths = set(pool.map(run, range(8)))
+
+        assert len(paths) == 1
+        assert os.listdir(output_dir) == [os.path.basename(paths.pop())]
+        wb = load_workbook(os.path.join(output_dir, os.listdir(output_dir)[0]))
+        assert wb.sheetnames == [
+            "Creator Payout Summary", "Video Audit", "Exceptions",
+        ]
+
+    def test_failed_save_keeps_previous_report(self, output_dir):
+        """A save that fails midway leaves the old report and no temp file."""
+        filepath = generate_report(
+            [make_summary()], [], [], date(2026, 2, 20), date(2026, 2, 21), output_dir,
+        )
+        with open(filepath, "rb") as f:
+            previous = f.read()
+
+        real_save = ExcelWriter.save
+
+        def save_then_fail(writer):
+            real_save(writer)
+            raise RuntimeError("disk full")
+
+        with patch.object(ExcelWriter, "save", save_then_fail):
+            with pytest.raises(RuntimeError):
+                generate_report(
+                    [], [], [], date(2026, 2, 20), date(2026, 2, 21), output_dir,
+                )
+
+        assert os.listdir(output_dir) == [os.path.basename(filepath)]
+        with open(filepath, "rb") as f:
+            assert f.read() == previous
+
 
 # ===========================================================================
 # 2. TAB STRUCTURE
@@ -326,9 +373,9 @@ class TestTab2VideoAudit:
         ws = wb["Video Audit"]
         # Row 2-3: Alice (2020 then 2022)
         assert ws.cell(row=2, column=1).value == "Alice"
-        assert ws.cell(row=2, column=2).value == "2026-02-20"
+        assert ws.cell(row=2, column=2).value == datetime(2026, 2, 20)
         assert ws.cell(row=3, column=1).value == "Alice"
-        assert ws.cell(row=3, column=2).value == "2026-02-22"
+        assert ws.cell(row=3, column=2).value == datetime(2026, 2, 22)
         # Row 4: Bob
         assert ws.cell(row=4, column=1).value == "Bob"
         # Row 5: Charlie
@@ -565,6 +612,55 @@ class TestFormatting:
         views_cell = ws.cell(row=2, column=5)
         assert views_cell.number_format == NUMBER_FORMAT
 
+    def test_consecutive_rows_keep_own_values_and_formats(self, output_dir):
+        """Formatted cells of one row are not overwritten by the next row."""
+        units = [
+            make_paired_unit("Alice", tt_views=1000, ig_views=2000, payout=35.0,
+                             uploaded_at_date=date(2026, 2, 20)),
+            make_paired_unit("Alice", tt_views=3000, ig_views=4000, payout=100.0,
+                             uploaded_at_date=date(2026, 2, 21)),
+        ]
+        filepath = generate_report(
+            [], units, [], date(2026, 2, 20), date(2026, 2, 21), output_dir,
+        )
+        wb = load_workbook(filepath)
+        ws = wb["Video Audit"]
+
+        # Uploaded At (col B), TikTok Views (col E), Payout Amount (col J)
+        expected = [
+            (datetime(2026, 2, 20), 1000, 35.0),
+            (datetime(2026, 2, 21), 3000, 100.0),
+        ]
+        for row_idx, (uploaded, tt_views, payout) in enumerate(expected, 2):
+            uploaded_cell = ws.cell(row=row_idx, column=2)
+            views_cell = ws.cell(row=row_idx, column=5)
+            payout_cell = ws.cell(row=row_idx, column=10)
+            assert uploaded_cell.value == uploaded
+            assert uploaded_cell.number_format == DATE_FORMAT
+            assert views_cell.value == tt_views
+            assert views_cell.number_format == NUMBER_FORMAT
+            assert payout_cell.value == payout
+            assert payout_cell.number_format == CURRENCY_FORMAT
+
+    def test_dates_written_as_native_excel_dates(self, output_dir):
+        """Uploaded At / Latest Updated At are date cells, not text."""
+        unit = make_paired_unit("Alice", uploaded_at_date=date(2026, 2, 20))
+        exc = make_exception().model_copy(update={"uploaded_at": date(2026, 2, 20)})
+        filepath = generate_report(
+            [], [unit], [exc],
+            date(2026, 2, 20), date(2026, 2, 21), output_dir,
+        )
+        wb = load_workbook(filepath)
+        ws = wb["Video Audit"]
+        uploaded_cell = ws.cell(row=2, column=2)
+        updated_cell = ws.cell(row=2, column=13)
+        assert uploaded_cell.is_date and uploaded_cell.number_format == DATE_FORMAT
+        assert updated_cell.is_date and updated_cell.number_format == DATETIME_FORMAT
+        assert updated_cell.value == datetime(2026, 2, 21, 12, 0, 0)
+
+        exc_cell = wb["Exceptions"].cell(row=2, column=4)
+        assert exc_cell.is_date and exc_cell.number_format == DATE_FORMAT
+
     def test_auto_fit_columns(self, output_dir):
         """Column widths should be > 0 (auto-fit applied)."""
         filepath = generate_report(
@@ -582,6 +678,18 @@ class TestFormatting:
                     f"{sheet_name} col {col_letter} width={width}"
                 )
 
+    def test_column_width_sampled_from_leading_rows(self, output_dir):
+        """Widths come from the header + first WIDTH_SAMPLE_ROWS rows only."""
+        from openpyxl import Workbook
+        from services.excel_export import _set_column_widths, WIDTH_SAMPLE_ROWS
+
+        ws = Workbook(write_only=True).create_sheet("Widths")
+        rows = [("a" * 20, 1_234_567)] * WIDTH_SAMPLE_ROWS + [("b" * 40, 1)]
+        _set_column_widths(ws, ["Name", "Views"], rows)
+
+        assert ws.column_dimensions["A"].width == 22  # 20 chars + 2 padding
+        assert ws.column_dimensions["B"].width == 10  # "1234567" → min width
+
 
 # ===========================================================================
 # 7. EDGE CASES
@@ -702,14 +810,14 @@ class TestHelpers:
         result = _get_latest_updated_at(unit)
         assert result == datetime(2026, 2, 21, 14, 0)
 
-    def test_format_date(self):
-        assert _format_date(date(2026, 2, 20)) == "2026-02-20"
-        assert _format_date(None) is None
-
-    def test_format_datetime(self):
+    def test_excel_datetime(self):
         dt = datetime(2026, 2, 20, 14, 30, 45)
-        assert _format_datetime(dt) == "2026-02-20 14:30:45"
-        assert _format_datetime(None) is None
+        assert _excel_datetime(dt) == dt
+        assert _excel_datetime(None) is None
+
+    def test_excel_datetime_drops_offset_and_microseconds(self):
+        dt = datetime(2026, 2, 20, 14, 30, 45, 123456, tzinfo=timezone.utc)
+        assert _excel_datetime(dt) == datetime(2026, 2, 20, 14, 30, 45)
 
     def test_tab2_sort_key_ordering(self):
         """Sort key should order by creator name, then uploaded_at."""
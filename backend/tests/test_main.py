@@ -22,6 +22,9 @@ Tests verify:
   5. Pipeline integration
      - Multi-creator scenarios
      - Exception counts wired correctly to CreatorSummary
+  6. Creator mapping cache
+     - Repeat fetches within the TTL reuse the parsed sheet
+     - POST /api/creator-mapping/refresh forces a re-fetch
 
 All external dependencies (Shortimize API, Google Sheets) are mocked
 so tests run fast and don't require network access.
@@ -41,6 +44,7 @@ from fastapi.testclient import TestClient
 
 from models.schemas import Video, ExceptionVideo, Creator
 from main import app, _count_exceptions_per_creator
+from services import creator_mapping
 
 
 # ===========================================================================
@@ -256,8 +260,11 @@ class TestCalculateErrorHandling:
     """Error handling for external service failures."""
 
     @patch("main.fetch_creator_mapping")
-    def test_google_sheet_failure_returns_502(self, mock_fetch_mapping, client):
+    @patch("main.fetch_videos")
+    def test_google_sheet_failure_returns_502(self, mock_fetch_videos, mock_fetch_mapping, client):
+        # Both fetches run concurrently, so the video fetch is mocked too
         mock_fetch_mapping.side_effect = Exception("Network error")
+        mock_fetch_videos.return_value = ([], [])
 
         response = client.post("/api/calculate", json={
             "start_date": "2026-02-20",
@@ -267,6 +274,21 @@ class TestCalculateErrorHandling:
         data = response.json()
         assert "creator mapping" in data["detail"]["message"].lower()
 
+    @patch("main.fetch_creator_mapping")
+    @patch("main.fetch_videos")
+    def test_both_fetches_fail_reports_creator_mapping(self, mock_fetch_videos, mock_fetch_mapping, client):
+        """Concurrent fetches both failing → the creator mapping error is reported."""
+        mock_fetch_mapping.side_effect = Exception("Network error")
+        mock_fetch_videos.side_effect = RuntimeError("API 500 error")
+
+        response = client.post("/api/calculate", json={
+            "start_date": "2026-02-20",
+            "end_date": "2026-02-21",
+        })
+        assert response.status_code == 502
+        assert "creator mapping" in response.json()["detail"]["message"].lower()
+        mock_fetch_videos.assert_called_once()
+
     @patch("main.fetch_creator_mapping")
     @patch("main.fetch_videos")
     def test_shortimize_failure_returns_502(self, mock_fetch_videos, mock_fetch_mapping, client):
@@ -300,6 +322,25 @@ class TestCalculateErrorHandling:
         assert data["summary"]["total_payout"] == 0
         assert data["summary"]["total_videos_processed"] == 0
 
+    @patch("services.matcher.match_videos")
+    @patch("main.fetch_creator_mapping")
+    @patch("main.fetch_videos")
+    def test_no_valid_videos_skips_matching(self, mock_fetch_videos, mock_fetch_mapping,
+                                            mock_match, client, output_dir):
+        """Only API exceptions → matcher never runs, report still generated."""
+        mock_fetch_mapping.return_value = (MOCK_CREATORS, MOCK_TT_MAP, MOCK_IG_MAP)
+        mock_fetch_videos.return_value = ([], [make_exception("alice_tt", "tiktok")])
+
+        response = client.post("/api/calculate", json={
+            "start_date": "2026-02-20",
+            "end_date": "2026-02-21",
+        })
+        assert response.status_code == 200
+        data = response.json()
+        mock_match.assert_not_called()
+        assert data["summary"]["total_exceptions"] == 1
+        assert os.path.exists(os.path.join(output_dir, data["filename"]))
+
 
 # ===========================================================================
 # 4. GET /api/download/{filename}
@@ -328,11 +369,56 @@ class TestDownloadEndpoint:
         assert "attachment" in response.headers.get("content-disposition", "")
         assert response.headers.get("content-type") == \
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        assert response.headers.get("etag")
+        assert response.headers.get("last-modified")
+        assert response.content[:2] == b"PK"  # xlsx is a zip archive
+
+    @patch("main.fetch_creator_mapping")
+    @patch("main.fetch_videos")
+    def test_download_is_not_gzipped(self, mock_fetch_videos, mock_fetch_mapping, client, output_dir):
+        """xlsx is already a zip archive — never gzip it again."""
+        mock_fetch_mapping.return_value = (MOCK_CREATORS, MOCK_TT_MAP, MOCK_IG_MAP)
+        mock_fetch_videos.return_value = (MOCK_VIDEOS, [])
+
+        filename = client.post("/api/calculate", json={
+            "start_date": "2026-02-20",
+            "end_date": "2026-02-21",
+        }).json()["filename"]
+
+        response = client.get(
+            f"/api/download/{filename}", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    @patch("main.fetch_creator_mapping")
+    @patch("main.fetch_videos")
+    def test_download_deleted_report_returns_404(self, mock_fetch_videos, mock_fetch_mapping, client, output_dir):
+        """A generated report purged from disk is a 404, not a 500."""
+        mock_fetch_mapping.return_value = (MOCK_CREATORS, MOCK_TT_MAP, MOCK_IG_MAP)
+        mock_fetch_videos.return_value = (MOCK_VIDEOS, [])
+
+        filename = client.post("/api/calculate", json={
+            "start_date": "2026-02-20",
+            "end_date": "2026-02-21",
+        }).json()["filename"]
+        assert client.get(f"/api/download/{filename}").status_code == 200
+
+        file_path = os.path.join(output_dir, filename)
+        os.remove(file_path)
+
+        response = client.get(f"/api/download/{filename}")
+        assert response.status_code == 404
 
     def test_download_nonexistent_file_returns_404(self, client):
         response = client.get("/api/download/nonexistent.xlsx")
         assert response.status_code == 404
 
+    def test_download_directory_returns_404(self, client, output_dir):
+        os.makedirs(os.path.join(output_dir, "not_a_report.xlsx"))
+        response = client.get("/api/download/not_a_report.xlsx")
+        assert response.status_code == 404
+
 
 # ===========================================================================
 # 5. _count_exceptions_per_creator tests
@@ -572,3 +658,75 @@ class TestNoCreatorMapping:
         assert data["summary"]["total_payout"] == 0
         # All 3 videos should be in exceptions as "Not in creator status list"
         assert data["summary"]["total_exceptions"] == 3
+
+
+# ===========================================================================
+# 10. Creator mapping cache + POST /api/creator-mapping/refresh
+# ===========================================================================
+
+class TestCreatorMappingCache:
+    """Test the creator mapping TTL cache and its refresh endpoint."""
+
+    SHEET_CSV = "\n".join([
+        ",".join(["header"] * 17),
+        ",".join(["header"] * 17),
+        ",Alice" + "," * 14 + "alice_ig,alice_tt",
+    ])
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        creator_mapping.invalidate_creator_mapping_cache()
+        yield
+        creator_mapping.invalidate_creator_mapping_cache()
+
+    def _fake_client(self, headers=None):
+        client = MagicMock()
+        client.get.return_value.status_code = 200
+        client.get.return_value.headers = headers or {}
+        client.get.return_value.content = self.SHEET_CSV.encode("utf-8")
+        client.get.return_value.encoding = "utf-8"
+        return client
+
+    def test_second_fetch_served_from_cache(self):
+        http_client = self._fake_client()
+
+        first = creator_mapping.fetch_creator_mapping(http_client)
+        second = creator_mapping.fetch_creator_mapping(http_client)
+
+        assert http_client.get.call_count == 1
+        assert second == first
+        assert first[1] == {"alice_tt": "Alice"}
+        assert first[2] == {"alice_ig": "Alice"}
+
+    def test_expired_cache_refetches(self):
+        http_client = self._fake_client()
+
+        creator_mapping.fetch_creator_mapping(http_client)
+        with patch.object(creator_mapping, "MAPPING_CACHE_TTL", 0.0):
+            creator_mapping.fetch_creator_mapping(http_client)
+
+        assert http_client.get.call_count == 2
+
+    def test_expired_cache_revalidates_with_etag(self):
+        http_client = self._fake_client(headers={"ETag": '"v1"'})
+        first = creator_mapping.fetch_creator_mapping(http_client)
+        assert http_client.get.call_args.kwargs["headers"] is None
+
+        http_client.get.return_value.status_code = 304
+        http_client.get.return_value.content = b""
+        with patch.object(creator_mapping, "MAPPING_CACHE_TTL", 0.0):
+            second = creator_mapping.fetch_creator_mapping(http_client)
+
+        assert http_client.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        assert second is first
+
+    def test_refresh_endpoint_invalidates_cache(self, client):
+        http_client = self._fake_client()
+        creator_mapping.fetch_creator_mapping(http_client)
+
+        response = client.post("/api/creator-mapping/refresh")
+        assert response.status_code == 200
+        assert response.json() == {"status": "success"}
+
+        creator_mapping.fetch_creator_mapping(http_client)
+        assert http_client.get.call_count == 2
@@ -27,8 +27,11 @@ Test categories:
 
 import sys
 import os
+import imagehash
+import numpy as np
 import pytest
 from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
 
 # Ensure backend is on the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -42,12 +45,29 @@ from services.matcher import (
     _build_paired_unit,
     _video_length_diff,
 )
+from yt_dlp.utils import DownloadError
+
+from services.frame_extractor import (
+    _deadline_hook,
+    _open_frame,
+    _phash_pixels,
+    hamming_distance,
+    phash_to_int,
+    prefetch_phashes,
+)
+from services import frame_extractor, phash_cache
 
 
 # ===========================================================================
 # Test helpers
 # ===========================================================================
 
+FAKE_HASHES = {
+    "a": imagehash.hex_to_hash("ffff000000000000"),
+    "b": imagehash.hex_to_hash("0000ffff00000000"),
+}
+
+
 def make_video(
     username: str = "testuser",
     platform: str = "tiktok",
@@ -612,6 +632,16 @@ class TestCreatorMapping:
         assert len(exceptions) == 1
         assert exceptions[0].username == "unknown_tt"
 
+    def test_unmapped_exception_keeps_normalized_username(self):
+        """Exception rows carry the normalized handle used for the lookup."""
+        videos = [
+            make_video(" Unknown_TT ", "tiktok", 30, 5000, "2026-02-20T10:00:00+00:00", "link8"),
+        ]
+        _, exceptions = _map_videos_to_creators(videos, {}, {})
+        assert exceptions[0].username == " Unknown_TT "
+        assert exceptions[0].normalized_username == "unknown_tt"
+        assert "normalized_username" not in exceptions[0].model_dump()
+
 
 # ===========================================================================
 # ADDITIONAL TEST: Step 6 — Deduplication
@@ -2341,3 +2371,217 @@ class TestFallbackUploadedAtSameDate:
         assert len(payout_units) == 1
         # First candidate in sorted order is Candidate A (ig_uf2, @12:30, views=2000)
         assert payout_units[0].instagram_video.latest_views == 2000
+
+
+# ===========================================================================
+# ADDITIONAL TEST: Phash prefetch
+# ===========================================================================
+
+class TestPhashPrefetch:
+    """Phashes are extracted concurrently up front, once per ad_link."""
+
+    def test_prefetch_fills_cache_once_per_link(self):
+        cache = {"cached": None}
+        with patch(
+            "services.frame_extractor.extract_phash",
+            side_effect=lambda link: FAKE_HASHES[link],
+        ) as mock_extract:
+            prefetch_phashes(["a", "b", "a", "cached"], cache, workers=4)
+
+        assert sorted(call.args[0] for call in mock_extract.call_args_list) == ["a", "b"]
+        assert cache == {"cached": None, "a": FAKE_HASHES["a"], "b": FAKE_HASHES["b"]}
+
+    def test_prefetch_reuses_disk_cache_across_runs(self):
+        with patch(
+            "services.frame_extractor.extract_phash",
+            side_effect=lambda link: FAKE_HASHES.get(link),
+        ) as mock_extract:
+            prefetch_phashes(["a", "missing"], {})
+            mock_extract.reset_mock()
+
+            next_run_cache = {}
+            prefetch_phashes(["a", "missing"], next_run_cache)
+
+        # Both come from disk — the recent failure is not re-downloaded
+        mock_extract.assert_not_called()
+        assert next_run_cache == {"a": FAKE_HASHES["a"], "missing": None}
+
+    def test_prefetch_retries_expired_failures(self, monkeypatch):
+        with patch(
+            "services.frame_extractor.extract_phash",
+            side_effect=lambda link: FAKE_HASHES.get(link),
+        ) as mock_extract:
+            prefetch_phashes(["a", "missing"], {})
+            mock_extract.reset_mock()
+
+            monkeypatch.setattr(phash_cache, "FAILED_PHASH_CACHE_TTL", -1)
+            prefetch_phashes(["a", "missing"], {})
+
+        # "a" is still fresh; the failure has expired and is retried
+        assert [call.args[0] for call in mock_extract.call_args_list] == ["missing"]
+
+    def test_match_videos_prefetches_only_matchable_creators(self, mock_frame_extraction):
+        videos = [
+            make_video("p_tt", "tiktok", 30, 5000, "2026-02-20T10:00:00+00:00", "tt_p1"),
+            make_video("p_ig", "instagram", 30, 8000, "2026-02-20T10:30:00+00:00", "ig_p1"),
+            make_video("q_tt", "tiktok", 45, 1000, "2026-02-20T11:00:00+00:00", "tt_q1"),
+        ]
+        match_videos(videos, {"p_tt": "P", "q_tt": "Q"}, {"p_ig": "P"})
+
+        # Q only posted on TikTok, so its video can never be hashed
+        mock_prefetch = mock_frame_extraction["prefetch_phashes"]
+        mock_prefetch.assert_called_once()
+        assert sorted(mock_prefetch.call_args.args[0]) == ["ig_p1", "tt_p1"]
+
+
+class TestLengthOverlapEarlyExit:
+    """Videos with no TT/IG length counterpart within ±1s are never hashed."""
+
+    def test_disjoint_lengths_skip_frame_extraction(self, mock_frame_extraction):
+        tt = [make_video("c_tt", "tiktok", 30, 1000, "2026-02-20T10:00:00+00:00", "tt1")]
+        ig = [make_video("c_ig", "instagram", 45, 1000, "2026-02-20T10:00:00+00:00", "ig1")]
+
+        payout_units, exceptions = _match_creator_videos("Alice", tt, ig)
+
+        assert payout_units == []
+        assert [e.reason for e in exceptions] == ["Only posted on one platform"] * 2
+        mock_frame_extraction["get_phash"].assert_not_called()
+
+    def test_lengths_within_tolerance_still_hashed(self, mock_frame_extraction):
+        tt = [make_video("c_tt", "tiktok", 30, 1000, "2026-02-20T10:00:00+00:00", "tt1")]
+        ig = [make_video("c_ig", "instagram", 31, 1000, "2026-02-20T10:00:00+00:00", "ig1")]
+
+        payout_units, _ = _match_creator_videos("Alice", tt, ig)
+
+        assert len(payout_units) == 1
+        assert mock_frame_extraction["get_phash"].called
+
+    def test_fallback_skips_videos_without_length_counterpart(self, mock_frame_extraction):
+        """Only unmatched videos with a ±1s counterpart are hashed in Step 10."""
+        mock_get_phash = mock_frame_extraction["get_phash"]
+        mock_get_phash.return_value = None  # every extraction would fail
+
+        tt = [
+            make_video("c_tt", "tiktok", 30, 1000, "2026-02-20T10:00:00+00:00", "tt1"),
+            make_video("c_tt", "tiktok", 60, 1000, "2026-02-21T10:00:00+00:00", "tt2"),
+        ]
+        ig = [make_video("c_ig", "instagram", 61, 1000, "2026-02-20T10:00:00+00:00", "ig1")]
+
+        payout_units, exceptions = _match_creator_videos("Alice", tt, ig)
+
+        hashed = {call.args[0] for call in mock_get_phash.call_args_list}
+        assert hashed == {"tt2", "ig1"}
+        reasons = {e.ad_link: e.reason for e in exceptions}
+        assert reasons["tt1"] == "Only posted on one platform"
+        assert reasons["tt2"] != "Only posted on one platform"
+
+    def test_prefetch_skips_videos_without_length_counterpart(self, mock_frame_extraction):
+        videos = [
+            make_video("p_tt", "tiktok", 30, 5000, "2026-02-20T10:00:00+00:00", "tt_p1"),
+            make_video("p_tt", "tiktok", 90, 5000, "2026-02-21T10:00:00+00:00", "tt_p2"),
+            make_video("p_ig", "instagram", 29, 8000, "2026-02-20T10:30:00+00:00", "ig_p1"),
+        ]
+        match_videos(videos, {"p_tt": "P"}, {"p_ig": "P"})
+
+        mock_prefetch = mock_frame_extraction["prefetch_phashes"]
+        assert sorted(mock_prefetch.call_args.args[0]) == ["ig_p1", "tt_p1"]
+
+
+class TestPersistentPhashCache:
+    """On-disk phash cache round-trips hashes and honours the TTL."""
+
+    def test_round_trip(self):
+        phash_cache.store_phashes({"a": FAKE_HASHES["a"], "failed": None})
+        assert phash_cache.load_phashes(["a", "b", "failed"]) == {
+            "a": FAKE_HASHES["a"], "failed": None,
+        }
+
+    def test_expired_entries_are_misses(self, monkeypatch):
+        phash_cache.store_phashes({"a": FAKE_HASHES["a"]})
+        monkeypatch.setattr(phash_cache, "PHASH_CACHE_TTL", -1)
+        assert phash_cache.load_phashes(["a"]) == {}
+
+    def test_unusable_database_is_a_miss(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(phash_cache, "DB_PATH", str(tmp_path))  # a directory
+        phash_cache.store_phashes({"a": FAKE_HASHES["a"]})
+        assert phash_cache.load_phashes(["a"]) == {}
+
+
+class TestPackedPhashDistance:
+    """Packed-int hamming distance agrees with ImageHash subtraction."""
+
+    def test_matches_imagehash_subtraction(self):
+        h1, h2 = FAKE_HASHES["a"], FAKE_HASHES["b"]
+        assert hamming_distance(phash_to_int(h1), phash_to_int(h2)) == h1 - h2 == 32
+        assert hamming_distance(phash_to_int(h1), phash_to_int(h1)) == 0
+
+    def test_fallback_rejects_distant_hashes(self, mock_frame_extraction):
+        """Fallback distance comes from the real hashes, not compare_hashes."""
+        hashes = {"tt_far": FAKE_HASHES["a"], "ig_far1": FAKE_HASHES["a"], "ig_far2": FAKE_HASHES["b"]}
+        mock_frame_extraction["get_phash"].side_effect = lambda link, cache: hashes[link]
+
+        tt = [make_video("far_tt", "tiktok", 45, 5000, "2026-02-20T10:00:00+00:00", "tt_far")]
+        ig = [
+            make_video("far_ig", "instagram", 30, 8000, "2026-02-20T10:30:00+00:00", "ig_far1"),
+            make_video("far_ig", "instagram", 45, 3000, "2026-02-20T12:00:00+00:00", "ig_far2"),
+        ]
+        payout_units, exceptions = _match_creator_videos("Far", tt, ig)
+        assert payout_units == []
+        assert len(exceptions) == 3
+
+
+class TestRawFrameDecoding:
+    """ffmpeg's raw 32x32 grayscale output is wrapped without a codec."""
+
+    def test_wraps_raw_pixels(self):
+        img = _open_frame(bytes(range(256)) * 4)
+        assert img.mode == "L"
+        assert img.size == (32, 32)
+        assert img.getpixel((1, 0)) == 1
+
+    def test_phash_matches_imagehash(self):
+        rng = np.random.default_rng(7)
+        for _ in range(20):
+            img = _open_frame(rng.integers(0, 256, 1024, dtype=np.uint8).tobytes())
+            assert _phash_pixels(img) == imagehash.phash(img)
+
+    def test_short_output_rejected(self):
+        with pytest.raises(ValueError):
+            _open_frame(b"\x00" * 100)
+
+
+class TestDownloadDeadline:
+    """In-process yt-dlp downloads are aborted after YTDLP_TIMEOUT."""
+
+    def test_hook_raises_once_deadline_passes(self):
+        _deadline_hook(60)({"status": "downloading"})  # well within deadline
+
+        hook = _deadline_hook(-1)
+        hook({"status": "finished"})  # only in-flight downloads are aborted
+        with pytest.raises(DownloadError):
+            hook({"status": "downloading"})
+
+    def test_download_past_deadline_fails_extraction(self, monkeypatch):
+        class SlowYoutubeDL:
+            """Reports download progress, as yt-dlp does for each chunk."""
+
+            def __init__(self, options):
+                self.options = options
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def download(self, urls):
+                for hook in self.options.get("progress_hooks", []):
+                    hook({"status": "downloading"})
+                open(self.options["outtmpl"], "wb").close()
+
+        monkeypatch.setattr(frame_extractor, "YTDLP_TIMEOUT", -1)
+        with patch.object(frame_extractor, "YoutubeDL", SlowYoutubeDL), \
+                patch.object(frame_extractor.subprocess, "run") as mock_run:
+            assert frame_extractor._extract_first_frame_from_download("https://x") is None
+
+        mock_run.assert_not_called()
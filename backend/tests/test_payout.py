@@ -336,6 +336,23 @@ class TestProcessPayouts:
         result = process_payouts([])
         assert result == []
 
+    def test_matches_scalar_tier_calculation_at_boundaries(self):
+        """Vectorized tiers agree with calculate_payout on every tier edge."""
+        edges = [0, 1, 999, 1_000, 9_999, 10_000, 49_999, 50_000, 99_999,
+                 100_000, 249_999, 250_000, 499_999, 500_000, 999_999,
+                 1_000_000, 1_999_999, 2_000_000, 4_999_999, 5_000_000,
+                 5_999_999, 6_000_000, 6_999_999, 7_000_000, 9_999_999,
+                 10_000_000, 10_000_001, 250_000_000]
+        units = [make_payout_unit(chosen_views=v) for v in edges]
+        process_payouts(units)
+
+        for views, unit in zip(edges, units):
+            expected_effective = calculate_effective_views(views)
+            assert unit.effective_views == expected_effective
+            assert unit.payout_amount == calculate_payout(expected_effective)
+            assert type(unit.effective_views) is int
+            assert type(unit.payout_amount) is float
+
     def test_capped_unit_preserves_chosen_views(self):
         """Capped video: chosen_views=15M, effective=10M, payout=$2,250."""
         unit = make_payout_unit(chosen_views=15_000_000)